@@ -26,16 +26,38 @@ conferenceSchedulePage = 'program/';
 
 timeZone = 'EDT';
 
+# used for the iCalendar (.ics) feeds
+calendarName = 'Conference Program';
+calendarYear = 2023;
+calendarTimeZone = 'America/New_York';
+calendarUIDDomain = 'conf-program-generator';
+
 # in minutes
 paperLength = 16;
 
+# several outputs (-o) are rendered in separate processes once the input
+#   files add up to at least this many bytes; for smaller inputs, starting
+#   the processes takes longer than rendering one output after another
+parallelInputSize = 4 * 1024 * 1024;
+
 mapPaths = {
         # 'Grand AB'  : 'test.png',
         # path used for all other locations
         '-default-' : 'attend/'
         };
 
+# used when local keynote photos are resized (gensched.py --photos);
+#   photoURLPath is where the site serves the --photos directory from
+photoWidths = [160, 320, 640];
+photoQuality = 82;
+photoURLPath = 'img/keynotes/';
+photoSizes = '(max-width: 767px) 40vw, 160px';
+
 printLocations = False;
 printJSInline = False;
 
 printIndent = 2;
+
+# markup templates for the schedule (relative to gensched.py);
+#   copy and edit to adapt to a different site
+templateFile = 'templates/bootstrap.tmpl';
@@ -6,14 +6,38 @@
 #   for conference programs
 
 
+import re
 import csv
 import sys
 import html
+import json
+import hashlib
+import datetime
+import zoneinfo
+import concurrent.futures
+import os
 import argparse
 from collections import OrderedDict
 
 from affilclean import *
 from confconfig import *
+from schedtemplate import *
+from textbackends import *
+from progdiff import save_program_state
+from photoassets import process_keynote_photos
+
+# default input file names
+inputFiles = OrderedDict([
+        ('schedule', 'schedule.csv'),
+        ('info', 'session-info.csv'),
+        ('papers', 'session-papers.csv'),
+        ('authors', 'authors.csv'),
+        ('links', 'paper-links.csv'),
+        ('keynotes', 'keynotes.csv')
+        ]);
+
+# characters read at a time from a HotCRP export (see iterate_json_array)
+hotcrpChunkSize = 65536;
 
 # currently supports 20 separate sessions
 sessionIDs = ["i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x", "xi", "xii", "xiii", "xiv", "xv", "xvi", "xvii", "xviii", "xix", "xx"];
@@ -22,9 +46,15 @@ sessionIDs = ["i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x", "xi",
 subsessionIDs = ["a", "b", "c", "d", "e", "f", "g", "h"]
 
 paperTitleByID = {};
+paperIDByTitle = {};
 paperAuthorsByTitle = {};
 paperLinksByTitle = {};
 
+# per-author records (first, last, affiliation, email) for each paper
+paperAuthorListByTitle = {};
+# author key -> name, affiliation, and list of talks; see build_author_index
+authorIndex = OrderedDict();
+
 subsessionLabels = [];
 sessionLabels = [];
 
@@ -34,6 +64,8 @@ sessionHTMLIDs = {};
 
 keynoteDetails = {};
 keynoteHTMLIDs = {};
+# keynote -> resized photo variants; filled in by the optional photo stage
+keynotePhotoVariants = {};
 
 eventDay = [];
 eventType = [];
@@ -46,6 +78,25 @@ eventNotes = [];
 locationFloors = {};
 
 
+def record_paper(paperID, paperTitle, paperAuthors, authorList):
+    global paperTitleByID;
+    global paperAuthorsByTitle;
+    global paperAuthorListByTitle;
+    global paperIDByTitle;
+
+    if paperID in paperTitleByID:
+        print("ERROR: Duplicate ID " + paperID, file=sys.stderr);
+    else:
+        paperTitleByID[paperID] = paperTitle;
+
+    if paperTitle in paperAuthorsByTitle:
+        print("ERROR: Duplicate Title '" + paperTitle + "'", file=sys.stderr);
+    else:
+        paperAuthorsByTitle[paperTitle] = paperAuthors;
+        paperAuthorListByTitle[paperTitle] = authorList;
+        paperIDByTitle[paperTitle] = paperID;
+
+
 def read_authors(filename):
     global paperTitleByID;
     global paperAuthorsByTitle;
@@ -60,6 +111,7 @@ def read_authors(filename):
         currentAffiliation = "";
         paperTitle = "";
         paperAuthors = "";
+        authorList = [];
 
         for row in authorFile:
             if currentPaper != row[0]:
@@ -70,19 +122,12 @@ def read_authors(filename):
                     # print("Title: " + paperTitle);
                     # print("Authors: " + paperAuthors + '\n');
 
-                    if currentPaper in paperTitleByID:
-                        print("ERROR: Duplicate ID " + currentPaper, file=sys.stderr);
-                    else:
-                        paperTitleByID[currentPaper] = paperTitle;
-
-                    if paperTitle in paperAuthorsByTitle:
-                        print("ERROR: Duplicate Title '" + paperTitle + "'", file=sys.stderr);
-                    else:
-                        paperAuthorsByTitle[paperTitle] = paperAuthors;
+                    record_paper(currentPaper, paperTitle, paperAuthors, authorList);
 
                 currentPaper = row[0];
                 paperTitle = row[1];
                 paperAuthors = "";
+                authorList = [];
                 currentAffiliation = "";
             
             if len(row) > 6 and row[7] == "nonauthor":
@@ -100,6 +145,7 @@ def read_authors(filename):
 
             currentAffiliation = cleanedAffiliation;
             paperAuthors += row[2] + " " + row[3]
+            authorList.append((row[2], row[3], cleanedAffiliation, row[4]));
         
         if currentPaper != "":
             if currentAffiliation != "":
@@ -108,19 +154,109 @@ def read_authors(filename):
             # print("Title: " + paperTitle);
             # print("Authors: " + paperAuthors + '\n');
 
-            if currentPaper in paperTitleByID:
-                print("ERROR: Duplicate ID " + currentPaper, file=sys.stderr);
-            else:
-                paperTitleByID[currentPaper] = paperTitle;
-
-            if paperTitle in paperAuthorsByTitle:
-                print("ERROR: Duplicate Title '" + paperTitle + "'", file=sys.stderr);
-            else:
-                paperAuthorsByTitle[paperTitle] = paperAuthors;
+            record_paper(currentPaper, paperTitle, paperAuthors, authorList);
     
     print("STAT: " + str(len(paperAuthorsByTitle)) + " papers in " + filename, file=sys.stderr);
 
 
+def iterate_json_array(jsonFile, chunkSize = 65536):
+    # yields one element of a top-level JSON array at a time,
+    #   so that the full export never needs to be held in memory
+    decoder = json.JSONDecoder();
+    buffer = "";
+    started = False;
+
+    while True:
+        chunk = jsonFile.read(chunkSize);
+        buffer = buffer + chunk;
+
+        position = 0;
+        while True:
+            # skip whitespace and separators between elements
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position = position + 1;
+
+            if not started:
+                if position == len(buffer):
+                    break;
+                if buffer[position] != "[":
+                    raise ValueError("expected a JSON array at top level");
+                started = True;
+                position = position + 1;
+                continue;
+
+            if position == len(buffer):
+                break;
+            if buffer[position] == "]":
+                return;
+
+            try:
+                element, end = decoder.raw_decode(buffer, position);
+            except json.JSONDecodeError:
+                # element is split across chunks; read more input
+                if chunk == "":
+                    raise;
+                break;
+
+            # a scalar may continue in the next chunk (e.g., '-1500' of '-1500.0'),
+            #   so an element is only accepted once a delimiter follows it
+            if end == len(buffer) or buffer[end] not in " \t\r\n,]":
+                if any(char in " \t\r\n,]" for char in buffer[end:]):
+                    raise ValueError("unexpected " + repr(buffer[end]) + " after an element of the JSON array");
+                if chunk == "":
+                    raise ValueError("unterminated JSON array");
+                break;
+
+            yield element;
+            position = end;
+
+        buffer = buffer[position:];
+        if chunk == "":
+            if started:
+                raise ValueError("unterminated JSON array");
+            return;
+
+
+def read_authors_hotcrp(filename):
+    global paperAuthorsByTitle;
+    global hotcrpChunkSize;
+
+    with open(filename, mode = "r", encoding="utf8") as jsonFile:
+        for paper in iterate_json_array(jsonFile, hotcrpChunkSize):
+            if "pid" not in paper:
+                continue;
+
+            currentPaper = str(paper["pid"]);
+            paperTitle = paper.get("title", "");
+            paperAuthors = "";
+            authorList = [];
+            currentAffiliation = "";
+
+            # same formatting as read_authors: consecutive authors sharing an
+            #   affiliation are grouped under one parenthetical
+            for author in paper.get("authors", []):
+                cleanedAffiliation = clean_affil(author.get("affiliation", ""));
+                if cleanedAffiliation == "":
+                    cleanedAffiliation = "unaffiliated";
+
+                if paperAuthors != "":
+                    if currentAffiliation != cleanedAffiliation:
+                        paperAuthors += " (" + currentAffiliation + "); ";
+                    else:
+                        paperAuthors += ", ";
+
+                currentAffiliation = cleanedAffiliation;
+                paperAuthors += author.get("first", "") + " " + author.get("last", "");
+                authorList.append((author.get("first", ""), author.get("last", ""), cleanedAffiliation, author.get("email", "")));
+
+            if currentAffiliation != "":
+                paperAuthors += " (" + currentAffiliation + ")";
+
+            record_paper(currentPaper, paperTitle, paperAuthors, authorList);
+
+    print("STAT: " + str(len(paperAuthorsByTitle)) + " papers in " + filename, file=sys.stderr);
+
+
 def read_session(infoFilename, paperFilename):
     global sessionIDs;
     global subsessionIDs;
@@ -283,32 +419,171 @@ def read_links(filename):
         # print(paperLinksByTitle);
 
 
-def html_accent_replacement(text):
-    # adapted from https://code.activestate.com/recipes/546517-accent2htmlcodepy-convert-accents-and-special-char/
-    htmlcodes = ['&Aacute;', '&aacute;', '&Agrave;', '&Acirc;', '&agrave;', '&Acirc;', '&acirc;', '&Auml;', '&auml;', '&Atilde;', '&atilde;', '&Aring;', '&aring;', '&Aelig;', '&aelig;', '&Ccedil;', '&ccedil;', '&Eth;', '&eth;', '&Eacute;', '&eacute;', '&Egrave;', '&egrave;', '&Ecirc;', '&ecirc;', '&Euml;', '&euml;', '&Iacute;', '&iacute;', '&Igrave;', '&igrave;', '&Icirc;', '&icirc;', '&Iuml;', '&iuml;', '&Ntilde;', '&ntilde;', '&Oacute;', '&oacute;', '&Ograve;', '&ograve;', '&Ocirc;', '&ocirc;', '&Ouml;', '&ouml;', '&Otilde;', '&otilde;', '&Oslash;', '&oslash;', '&szlig;', '&Thorn;', '&thorn;', '&Uacute;', '&uacute;', '&Ugrave;', '&ugrave;', '&Ucirc;', '&ucirc;', '&Uuml;', '&uuml;', '&Yacute;', '&yacute;', '&yuml;', '&copy;', '&reg;', '&trade;', '&euro;', '&cent;', '&pound;', '&lsquo;', '&rsquo;', '&ldquo;', '&rdquo;', '&laquo;', '&raquo;', '&mdash;', '&ndash;', '&deg;', '&plusmn;', '&frac14;', '&frac12;', '&frac34;', '&times;', '&divide;', '&alpha;', '&beta;', '&infin;', '&Cacute;', '&cacute;']
-    rawcodes = ['\xc1','\xe1','\xc0','\xc2','\xe0','\xc2','\xe2','\xc4','\xe4','\xc3','\xe3','\xc5','\xe5','\xc6','\xe6','\xc7','\xe7','\xd0','\xf0','\xc9','\xe9','\xc8','\xe8','\xca','\xea','\xcb','\xeb','\xcd','\xed','\xcc','\xec','\xce','\xee','\xcf','\xef','\xd1','\xf1','\xd3','\xf3','\xd2','\xf2','\xd4','\xf4','\xd6','\xf6','\xd5','\xf5','\xd8','\xf8','\xdf','\xde','\xfe','\xda','\xfa','\xd9','\xf9','\xdb','\xfb','\xdc','\xfc','\xdd','\xfd','\xff','\xa9','\xae','\u2122','\u20ac','\xa2','\xa3','\u2018','\u2019','\u201c','\u201d','\xab','\xbb','\u2014','\u2013','\xb0','\xb1','\xbc','\xbd','\xbe','\xd7','\xf7','\u03b1','\u03b2','\u221e', '\u0106', '\u0107']
-    
-    newText = '';
+def build_session(sessionID, location):
+    global paperAuthorsByTitle;
+    global paperLinksByTitle;
+    global paperIDByTitle;
+    global sessionInfo;
+    global sessionPapers;
+    global sessionHTMLIDs;
+    global locationFloors;
+
+    papers = [];
+    for paper in sessionPapers[sessionID]:
+        if paper not in paperAuthorsByTitle:
+            print("  **ERROR**: Title '" + paper + "' in Session " + sessionID + " not found. Was the title updated?", file=sys.stderr);
+        papers.append(OrderedDict([
+                ('id', paperIDByTitle.get(paper)),
+                ('title', paper),
+                ('authors', paperAuthorsByTitle.get(paper)),
+                ('links', paperLinksByTitle.get(paper, OrderedDict()))
+                ]));
+
+    return OrderedDict([
+            ('id', sessionID),
+            ('htmlID', sessionHTMLIDs[sessionID]),
+            ('title', sessionInfo[sessionID]['Title']),
+            ('chair', sessionInfo[sessionID]['Chair']),
+            ('affiliation', sessionInfo[sessionID]['Affiliation']),
+            ('lightningTalks', sessionInfo[sessionID]['Lightning Talks']),
+            ('location', location),
+            ('floor', locationFloors.get(location)),
+            ('papers', papers)
+            ]);
+
+
+def build_keynote(keynoteID, location):
+    global keynoteDetails;
+    global keynoteHTMLIDs;
+    global keynotePhotoVariants;
+    global locationFloors;
 
-    for char in text:
-        if char not in rawcodes:
-            newText = newText + char;
+    if keynoteID not in keynoteDetails:
+        print("  **ERROR**: Keynote '" + keynoteID + "' not found in keynote details.", file=sys.stderr);
+        return None;
+
+    details = keynoteDetails[keynoteID];
+
+    return OrderedDict([
+            ('id', keynoteID),
+            ('htmlID', keynoteHTMLIDs[keynoteID]),
+            ('title', details['Title']),
+            ('speaker', details['Speaker']),
+            ('affiliation', details['Affiliation']),
+            ('photo', details['Photo URL']),
+            ('photoVariants', keynotePhotoVariants.get(keynoteID)),
+            ('abstract', details['Abstract']),
+            ('bio', details['Bio']),
+            ('links', details['Links']),
+            ('location', location),
+            ('floor', locationFloors.get(location))
+            ]);
+
+
+def build_event(event):
+    global eventDay;
+    global eventType;
+    global eventStart;
+    global eventEnd;
+    global eventNames;
+    global eventLocations;
+    global eventNotes;
+    global locationFloors;
+
+    names = eventNames[event];
+    locations = eventLocations[event];
+
+    # concurrent sessions in one row of the schedule are grouped together;
+    #   everything else (breaks, keynotes, etc.) is listed on its own
+    sessionLocations = OrderedDict();
+    items = [];
+    for i in range(len(names)):
+        if names[i][0:8].lower() == "session ":
+            sessionLocations[names[i][8:]] = locations[i];
         else:
-            newText  = newText + htmlcodes[rawcodes.index(char)];
+            keynote = None;
+            if eventType[event].lower() == "keynote":
+                keynote = build_keynote(names[i], locations[i]);
+            items.append(OrderedDict([
+                    ('name', names[i]),
+                    ('location', locations[i]),
+                    ('floor', locationFloors.get(locations[i])),
+                    ('keynote', keynote)
+                    ]));
+
+    return OrderedDict([
+            ('day', eventDay[event]),
+            ('type', eventType[event]),
+            ('start', eventStart[event]),
+            ('end', eventEnd[event]),
+            ('notes', eventNotes[event]),
+            ('sessions', [build_session(session, location) for session, location in sessionLocations.items()]),
+            ('items', items)
+            ]);
+
+
+def build_program():
+    global eventDay;
+    global workshopDates;
+    global conferenceDates;
+    global workshopDaysAbbr;
+    global workshopSchedulePage;
+    global conferenceSchedulePage;
+    global timeZone;
 
-    return newText;
+    # resolves everything read from the input files into one nested structure
+    #   (plain lists and OrderedDicts), which all output backends render from
+    event = 0;
 
+    workshopEvents = [];
+    while event < len(eventDay) and eventDay[event] in workshopDates:
+        workshopEvents.append(build_event(event));
+        event = event + 1;
 
-def make_html_safe(text):
-    return html_accent_replacement(html.escape(text)).strip();
+    days = [];
+    for day, date in conferenceDates.items():
+        dayEvents = [];
+        while event < len(eventDay) and eventDay[event] == day:
+            dayEvents.append(build_event(event));
+            event = event + 1;
+        days.append(OrderedDict([
+                ('number', len(days) + 1),
+                ('day', day),
+                ('date', date),
+                ('events', dayEvents)
+                ]));
+
+    if event < len(eventDay):
+        print("  **ERROR**: Events starting with " + eventDay[event] + " " + eventStart[event] + " are out of order or on an unknown day; skipped.", file=sys.stderr);
+
+    return OrderedDict([
+            ('timeZone', timeZone),
+            ('workshops', OrderedDict([
+                ('dates', OrderedDict(workshopDates)),
+                ('abbreviation', workshopDaysAbbr),
+                ('page', workshopSchedulePage),
+                ('events', workshopEvents)
+                ])),
+            ('schedulePage', conferenceSchedulePage),
+            ('days', days)
+            ]);
+
+
+# adapted from https://code.activestate.com/recipes/546517-accent2htmlcodepy-convert-accents-and-special-char/
+htmlCodes = ['&Aacute;', '&aacute;', '&Agrave;', '&Acirc;', '&agrave;', '&Acirc;', '&acirc;', '&Auml;', '&auml;', '&Atilde;', '&atilde;', '&Aring;', '&aring;', '&Aelig;', '&aelig;', '&Ccedil;', '&ccedil;', '&Eth;', '&eth;', '&Eacute;', '&eacute;', '&Egrave;', '&egrave;', '&Ecirc;', '&ecirc;', '&Euml;', '&euml;', '&Iacute;', '&iacute;', '&Igrave;', '&igrave;', '&Icirc;', '&icirc;', '&Iuml;', '&iuml;', '&Ntilde;', '&ntilde;', '&Oacute;', '&oacute;', '&Ograve;', '&ograve;', '&Ocirc;', '&ocirc;', '&Ouml;', '&ouml;', '&Otilde;', '&otilde;', '&Oslash;', '&oslash;', '&szlig;', '&Thorn;', '&thorn;', '&Uacute;', '&uacute;', '&Ugrave;', '&ugrave;', '&Ucirc;', '&ucirc;', '&Uuml;', '&uuml;', '&Yacute;', '&yacute;', '&yuml;', '&copy;', '&reg;', '&trade;', '&euro;', '&cent;', '&pound;', '&lsquo;', '&rsquo;', '&ldquo;', '&rdquo;', '&laquo;', '&raquo;', '&mdash;', '&ndash;', '&deg;', '&plusmn;', '&frac14;', '&frac12;', '&frac34;', '&times;', '&divide;', '&alpha;', '&beta;', '&infin;', '&Cacute;', '&cacute;']
+rawCodes = ['\xc1','\xe1','\xc0','\xc2','\xe0','\xc2','\xe2','\xc4','\xe4','\xc3','\xe3','\xc5','\xe5','\xc6','\xe6','\xc7','\xe7','\xd0','\xf0','\xc9','\xe9','\xc8','\xe8','\xca','\xea','\xcb','\xeb','\xcd','\xed','\xcc','\xec','\xce','\xee','\xcf','\xef','\xd1','\xf1','\xd3','\xf3','\xd2','\xf2','\xd4','\xf4','\xd6','\xf6','\xd5','\xf5','\xd8','\xf8','\xdf','\xde','\xfe','\xda','\xfa','\xd9','\xf9','\xdb','\xfb','\xdc','\xfc','\xdd','\xfd','\xff','\xa9','\xae','\u2122','\u20ac','\xa2','\xa3','\u2018','\u2019','\u201c','\u201d','\xab','\xbb','\u2014','\u2013','\xb0','\xb1','\xbc','\xbd','\xbe','\xd7','\xf7','\u03b1','\u03b2','\u221e', '\u0106', '\u0107']
+
+# character -> HTML code, for str.translate; built in reverse, so that a
+#   character listed twice keeps its first code
+htmlAccentTable = {ord(raw): code for raw, code in reversed(list(zip(rawCodes, htmlCodes)))};
 
 
-def generate_indent(indent):
-    pre = "";
-    for i in range(indent):
-        pre = pre + " ";
+def html_accent_replacement(text):
+    return text.translate(htmlAccentTable);
+
 
-    return pre;
+def make_html_safe(text):
+    return html_accent_replacement(html.escape(text)).strip();
 
 
 def get_map(location):
@@ -334,290 +609,362 @@ def format_media_link(label, url):
     elif label == 'Slides':
         css = 'fa-solid fa-chalkboard-user';
 
-    return '<a href="' + url + '"><span class="' + css + '"></span> ' + make_html_safe(label) + '</a>';
+    return render_inline('media-link', url=url, css=css, label=make_html_safe(label));
 
 
-def print_location(location, indent):
+def render_link_list(block, links, indent):
+    items = [];
+    for key, value in links.items():
+        if value == "":
+            continue;
+        items.append(render('link-item', indent + 2, link=format_media_link(key, value)));
+
+    if items == []:
+        return "";
+
+    return render(block, indent, links=render('link-separator', indent + 2).join(items));
+
+
+def render_notes(notes, indent):
+    if notes == "":
+        return "";
+
+    items = "";
+    for note in notes.split('\n'):
+        items += render('event-note', indent + 2, note=html_accent_replacement(note));
+
+    return render('event-notes', indent, notes=items);
+
+
+def render_location(location, floor, indent):
     global printLocations;
-    global locationFloors;
 
-    pre = generate_indent(indent);
+    if not (printLocations and location != "" and location != "other"):
+        return "";
 
-    if printLocations and location != "" and location != "other":
-        print(pre + '<h5 class="session-location">');
-        print(pre + '  Location: ' + html_accent_replacement(location));
-        if location in locationFloors:
-            locationMap = get_map(location);
-            print(pre + '  <span class="session-floor">(', end='');
-            if locationMap != '':
-                print('<a href="' + locationMap + '">', end='');
-            print('' + html_accent_replacement(locationFloors[location]), end='');
-            if locationMap != '':
-                print('</a>', end='');
-            print(')</span>');
-        print(pre + '</h5>');
+    # floor is None for locations that are not listed in the schedule header
+    floorLine = "";
+    if floor is not None:
+        locationMap = get_map(location);
+        floorName = html_accent_replacement(floor);
+        if locationMap != '':
+            floorName = render_inline('location-map-link', map=locationMap, floor=floorName);
+        floorLine = render('location-floor', indent + 2, floor=floorName);
 
+    return render('location', indent, location=html_accent_replacement(location), floor=floorLine);
 
-def print_session(sessionID, htmlID, location, width, indent):
-    global paperTitleByID;
-    global paperAuthorsByTitle;
-    global paperLinksByTitle;
-    global sessionInfo;
-    global sessionPapers;
 
-    pre = generate_indent(indent);
+def render_session(session, width, indent):
+    title = "";
+    if session['title'] != "":
+        title = render_inline('session-title', title=make_html_safe(session['title']));
 
-    print(pre + '<div class="schedule-session col-xs-12 col-md-' + str(width) + '">');
-    print(pre + '  <div class="panel panel-default panel-session">');
-    print(pre + '    <div class="panel-heading" role="tab" id="title-' + htmlID + '">');
-    print(pre + '      <h4 class="panel-title">')
-    print(pre + '        <a role="button" data-toggle="collapse" href="#' + htmlID + '" aria-expanded="true" aria-controls="' + htmlID + '">');
-    print(pre + '          Session ' + make_html_safe(sessionID), end='');
-    if sessionInfo[sessionID]['Title'] != "":
-        print(': ' + make_html_safe(sessionInfo[sessionID]['Title']));
-    else:
-        print();
-    print(pre + '        </a>');
-    print(pre + '      </h4>');
-    print_location(location, indent + 6);
-    print(pre + '    </div>');
-    print(pre);
-
-    print(pre + '    <div id="' + htmlID + '" class="panel-collapse panel-paper collapse in" role="tabpanel" aria-labelledby="title-' + htmlID + '">');
-    print(pre + '      <div class="panel-body">');
-
-    if sessionInfo[sessionID]['Chair'] != "":
-        print(pre + '        <div class="session-chair">');
-        print(pre + '          Session Chair: ' + make_html_safe(sessionInfo[sessionID]['Chair']), end='');
-        if sessionInfo[sessionID]['Affiliation'] != "":
-            print(' <span class="affiliation">(' + make_html_safe(sessionInfo[sessionID]["Affiliation"]) + ')</span>', end='');
-        print('\n' + pre + '        </div>');
+    chair = "";
+    if session['chair'] != "":
+        affiliation = "";
+        if session['affiliation'] != "":
+            affiliation = render_inline('session-chair-affiliation', affiliation=make_html_safe(session['affiliation']));
+        chair = render('session-chair', indent + 8, chair=make_html_safe(session['chair']), affiliation=affiliation);
 
-    if sessionInfo[sessionID]['Lightning Talks'] != "":
-        print(pre + '        <div class="session-links">');
-        print(pre + '          ' + format_media_link('Session Lightning Talks', sessionInfo[sessionID]['Lightning Talks']));
-        print(pre + '        </div>');
+    links = "";
+    if session['lightningTalks'] != "":
+        links = render('session-links', indent + 8, link=format_media_link('Session Lightning Talks', session['lightningTalks']));
 
-    separator = "";
+    papers = [];
 
-    for paper in sessionPapers[sessionID]:
-        print(separator + pre + '        <div class="paper">');
+    for paper in session['papers']:
         # TODO: add paper times
         # TODO: add best paper flags
-        print(pre + '          <div class="paper-title">');
-        print(pre + '            ' + make_html_safe(paper));
-        print(pre + '          </div>');
-        if paper in paperAuthorsByTitle:
-            print(pre + '          <div class="paper-authors">');
-            print(pre + '            ' + make_html_safe(paperAuthorsByTitle[paper]));
-            print(pre + '          </div>');
-        else:
-            print("  **ERROR**: Title '" + paper + "' in Session " + sessionID + " not found. Was the title updated?", file=sys.stderr);
-        if paper in paperLinksByTitle:
-            linksStarted = False;
-            linkSeparator = "";
-            for key, value in paperLinksByTitle[paper].items():
-                if value == "":
-                    continue;
-                if not linksStarted:
-                    linksStarted = True;
-                    print(pre + '          <div class="paper-links">');
-                print(linkSeparator + pre + '            ' + format_media_link(key, value));
-                linkSeparator = pre + '            &bull;\n';
-            if linksStarted:
-                print(pre + '          </div>');
-        print(pre + '        </div>');
-        separator = pre + '        <hr />\n';
-    
-    print(pre + '      </div>');
-    print(pre + '    </div>');
-    print(pre + '  </div>');
-    print(pre + '</div>');
+        authors = "";
+        if paper['authors'] is not None:
+            authors = render('paper-authors', indent + 10, authors=make_html_safe(paper['authors']));
+        papers.append(render('paper', indent + 8, title=make_html_safe(paper['title']), authors=authors,
+                links=render_link_list('paper-links', paper['links'], indent + 10)));
 
+    return render('session', indent, width=str(width), htmlID=session['htmlID'], sessionID=make_html_safe(session['id']), title=title,
+            location=render_location(session['location'], session['floor'], indent + 6), chair=chair, links=links,
+            papers=render('paper-separator', indent + 8).join(papers));
 
-def print_keynote(keynoteID, htmlID, location, indent):
-    global keynoteDetails;
-
-    pre = generate_indent(indent);
 
-    print(pre + '<div class="schedule-session col-xs-12">');
-    print(pre + '  <div class="panel panel-default panel-session panel-highlight">');
-    print(pre + '    <div class="panel-heading" role="tab" id="title-k-' + htmlID + '">');
-    print(pre + '      <h4 class="panel-title">')
-    print(pre + '        <a role="button" data-toggle="collapse" href="#k-' + htmlID + '" aria-expanded="true" aria-controls="k-' + htmlID + '">');
-    if keynoteDetails[keynoteID]["Title"] != "":
-        print(pre + '          ' + make_html_safe(keynoteDetails[keynoteID]["Title"]));
+def render_keynote(keynote, indent):
+    if keynote['title'] != "":
+        title = make_html_safe(keynote['title']);
     else:
-        print(pre + '          Title TBA');
-    print(pre + '        </a>');
-    print(pre + '      </h4>');
-    print_location(location, indent + 6);
-    print(pre + '    </div>');
-    print(pre);
-
-    print(pre + '    <div id="k-' + htmlID + '" class="panel-collapse panel-keynote collapse" role="tabpanel" aria-labelledby="title-k-' + htmlID + '">');
-    print(pre + '      <div class="panel-body">');
-
-    print(pre + '        <p>');
-    if keynoteDetails[keynoteID]["Photo URL"] != "":
-        print(pre + '          <img src="' + keynoteDetails[keynoteID]["Photo URL"] + '" alt="' + keynoteDetails[keynoteID]["Speaker"] + ' headshot" class="speaker-photo" />');
-    if keynoteDetails[keynoteID]["Abstract"] != "":
-        print(pre + '          <b>Abstract</b><br/>');
-        print(pre + '          ' + make_html_safe(keynoteDetails[keynoteID]["Abstract"]).replace('\n', '<br/>'));
+        title = render_inline('keynote-title-tba');
+
+    photo = "";
+    if keynote['photoVariants'] is not None:
+        variants = keynote['photoVariants'];
+        photo = render('keynote-photo-responsive', indent + 10, url=variants['src'], webp=variants['image/webp'],
+                jpeg=variants['image/jpeg'], sizes=photoSizes, speaker=keynote['speaker']);
+    elif keynote['photo'] != "":
+        photo = render('keynote-photo', indent + 10, url=keynote['photo'], speaker=keynote['speaker']);
+
+    if keynote['abstract'] != "":
+        abstract = render('keynote-abstract', indent + 10, abstract=make_html_safe(keynote['abstract']).replace('\n', '<br/>'));
     else:
-        print(pre + '          Abstract TBA');
-    print(pre + '        </p>');
-    linksStarted = False;
-    linkSeparator = "";
-    for key, value in keynoteDetails[keynoteID]['Links'].items():
-        if value == "":
-            continue;
-        if not linksStarted:
-            linksStarted = True;
-            print(pre + '        <div class="keynote-links">');
-        print(linkSeparator + pre + '          ' + format_media_link(key, value));
-        linkSeparator = pre + '          &bull;\n';
-    if linksStarted:
-        print(pre + '        </div>');
-
-    if keynoteDetails[keynoteID]["Bio"] != "":
-        print(pre + '        <hr />');
-        print(pre + '        <p>');
-        print(pre + '          <b>Bio</b><br/>');
-        print(pre + '          ' + make_html_safe(keynoteDetails[keynoteID]["Bio"]).replace('\n', '<br/>'));
-        print(pre + '        </p>');
+        abstract = render('keynote-abstract-tba', indent + 10);
 
-    
-    print(pre + '      </div>');
-    print(pre + '    </div>');
-    print(pre + '  </div>');
-    print(pre + '</div>');
+    bio = "";
+    if keynote['bio'] != "":
+        bio = render('keynote-bio', indent + 8, bio=make_html_safe(keynote['bio']).replace('\n', '<br/>'));
 
+    return render('keynote', indent, htmlID=keynote['htmlID'], title=title, location=render_location(keynote['location'], keynote['floor'], indent + 6),
+            photo=photo, abstract=abstract, links=render_link_list('keynote-links', keynote['links'], indent + 8), bio=bio);
 
-def print_jump_menu(indent):
-    global workshopDaysAbbr;
-    global conferenceDates;
-    global conferenceSchedulePage;
-
-    pre = generate_indent(indent);
 
+def render_jump_menu(program, indent):
     # TODO: add support for "Jump to Today" link
 
-    print(pre + '<div class="row schedule">');
-    print(pre + '  <div class="col-xs-12 text-center">');
-    print(pre + '    Jump to');
-    print(pre + '    <a href="' + conferenceSchedulePage + '#workshops">' + make_html_safe(workshopDaysAbbr) + '</a>', end = '');
+    separator = render_inline('jump-menu-separator');
+    links = [(program['schedulePage'], 'workshops', make_html_safe(program['workshops']['abbreviation']))];
 
-    numConferenceDays = 1;
-    for day, date in conferenceDates.items():
-        print(' |');
-        print(pre + '    <a href="' + conferenceSchedulePage + '#day' + str(numConferenceDays) + '">' + make_html_safe(day) + '</a>', end = '');
-        numConferenceDays = numConferenceDays + 1;
-    print();
-
-    print(pre + '    <br/><br/>');
-    print(pre + '    <a href="#" onclick="expandSessionsOnAll(); return false;">Expand All</a> / ');
-    print(pre + '    <a href="#" onclick="collapseSessionsOnAll(); return false;">Collapse All</a> Sessions');
-    print(pre + '  </div>');
-    print(pre + '</div>');
-    print(pre);
-    print(pre + '<hr />');
-    print(pre);
-
-
-def print_workshop_link(indent):
-    global workshopDates;
-    global workshopSchedulePage;
+    for day in program['days']:
+        links.append((program['schedulePage'], 'day' + str(day['number']), make_html_safe(day['day'])));
 
-    pre = generate_indent(indent);
+    menuLinks = "";
+    for i in range(len(links)):
+        page, anchor, label = links[i];
+        menuLinks += render('jump-menu-link', indent + 4, page=page, anchor=anchor, label=label,
+                separator=(separator if i < len(links) - 1 else ""));
 
-    print(pre + '<div class="col-xs-12">');
-    print(pre + '  <h2><a href="' + workshopSchedulePage + '">', end='');
-    separator = '';
-    for day, date in workshopDates.items():
-        print(separator + make_html_safe(day) + ', ' + make_html_safe(date), end='');
-        separator = ' / ';
-    print(': Workshops &amp; Tutorials</a></h2>');
-    print(pre + '</div>');
+    return render('jump-menu', indent, links=menuLinks);
 
 
-def print_event(day, eventType, start, end, names, locations, notes, indent):
-    global timeZone;
-    global sessionHTMLIDs;
-    global keynoteDetails;
+def render_workshop_link(workshops, indent):
+    dates = ' / '.join(make_html_safe(day) + ', ' + make_html_safe(date) for day, date in workshops['dates'].items());
 
-    pre = generate_indent(indent);
+    return render('workshop-link', indent, page=workshops['page'], dates=dates);
 
-    eventIndices = [];
-    sessionNames = OrderedDict();
-    
-    for i in range(len(names)):
-        if names[i][0:8].lower() == "session ":
-            sessionNames[names[i][8:]] = locations[i];
-        else:
-            eventIndices.append(i);
 
+def render_event(event, showDay, zone, indent):
+    day = event['day'] if showDay else "";
+
+    output = "";
     separator = "";
+    blankLine = render('event-separator', indent);
 
     typeFormat = "";
-    if eventType.lower() in ["meal", "break"]:
+    if event['type'].lower() in ["meal", "break"]:
         typeFormat = "secondary-event ";
 
-    if len(sessionNames) > 0:
-        print(pre + '<div class="schedule-time ' + typeFormat + 'col-xs-12">');
-        print(pre + '  <h3>', end='');
-        if day != "":
-            print(make_html_safe(day) + ', ', end='');
-        print(make_html_safe(start) + ' <span class="zone-name">' + make_html_safe(timeZone) + '</span> &ndash; ' + make_html_safe(end) + ' <span class="zone-name">' + make_html_safe(timeZone) + '</span></h3>');
-        if notes != "":
-            print(pre + '  <ul class="h5 session-notes">');
-            for note in notes.split('\n'):
-                print(pre + '    <li>' + html_accent_replacement(note) + '</li>');
-            print(pre + '  </ul>');
-        print(pre + '</div>');
-        for session, location in sessionNames.items():
-            print(pre);
-            print_session(session, sessionHTMLIDs[session], location, int(12 / len(sessionNames)), indent);
-        separator = pre + '\n';
-
-    for i in eventIndices:
-        print(separator, end='');
-        separator = pre + '\n';
-        print(pre + '<div class="schedule-time ' + typeFormat + 'col-xs-12">');
-        print(pre + '  <h3>', end='');
-        if day != "":
-            print(day + ', ', end='');
-        if eventType.lower() in ["keynote"]:
-            print();
-            print(pre + '    ' + make_html_safe(start) + ' <span class="zone-name">' + make_html_safe(timeZone) + '</span> &ndash; ' + make_html_safe(end) + ' <span class="zone-name">' + make_html_safe(timeZone) + '</span>:');
-            print(pre + '    ' + html_accent_replacement(names[i]), end='');
-            if names[i] in keynoteDetails.keys():
-                if keynoteDetails[names[i]]["Speaker"] != "":
-                    print(' by ' + make_html_safe(keynoteDetails[names[i]]["Speaker"]));
-                    if keynoteDetails[names[i]]["Affiliation"] != "":
-                      print(pre + '    <span class="affiliation">(' + make_html_safe(keynoteDetails[names[i]]["Affiliation"]) + ')</span>');
-                else:
-                    print();
-            print(pre + '  </h3>');
-            if notes != "":
-                print(pre + '  <ul class="h5 session-notes">');
-                for note in notes.split('\n'):
-                    print(pre + '    <li>' + html_accent_replacement(note) + '</li>');
-                print(pre + '  </ul>');
-            print(pre + '</div>');
-            print_keynote(names[i], keynoteHTMLIDs[names[i]], locations[i], indent);
+    zone = make_html_safe(zone);
+    start = make_html_safe(event['start']);
+    end = make_html_safe(event['end']);
+    notes = render_notes(event['notes'], indent + 2);
+
+    if len(event['sessions']) > 0:
+        output += render('event-time', indent, typeFormat=typeFormat, day=(make_html_safe(day) + ', ' if day != "" else ""),
+                start=start, end=end, zone=zone, name="", location="", notes=notes);
+        for session in event['sessions']:
+            output += blankLine;
+            output += render_session(session, int(12 / len(event['sessions'])), indent);
+        separator = blankLine;
+
+    for item in event['items']:
+        output += separator;
+        separator = blankLine;
+        if event['type'].lower() in ["keynote"]:
+            speaker = "";
+            affiliation = "";
+            keynote = item['keynote'];
+            if keynote is not None and keynote['speaker'] != "":
+                speaker = render_inline('event-keynote-speaker', speaker=make_html_safe(keynote['speaker']));
+                if keynote['affiliation'] != "":
+                    affiliation = render('event-keynote-affiliation', indent + 4, affiliation=make_html_safe(keynote['affiliation']));
+            output += render('event-keynote-time', indent, typeFormat=typeFormat, day=(day + ', ' if day != "" else ""),
+                    start=start, end=end, zone=zone, name=html_accent_replacement(item['name']),
+                    speaker=speaker, affiliation=affiliation, notes=notes);
+            if keynote is not None:
+                output += render_keynote(keynote, indent);
         else:
-            print(make_html_safe(start) + ' <span class="zone-name">' + make_html_safe(timeZone) + '</span> &ndash; ' + make_html_safe(end) + ' <span class="zone-name">' + make_html_safe(timeZone) + '</span>: ' + html_accent_replacement(names[i]) + '</h3>');
-            print_location(locations[i], indent + 2);
-            if notes != "":
-                print(pre + '  <ul class="h5 session-notes">');
-                for note in notes.split('\n'):
-                    print(pre + '    <li>' + html_accent_replacement(note) + '</li>');
-                print(pre + '  </ul>');
-            print(pre + '</div>');
+            output += render('event-time', indent, typeFormat=typeFormat, day=(day + ', ' if day != "" else ""),
+                    start=start, end=end, zone=zone,
+                    name=render_inline('event-name', name=html_accent_replacement(item['name'])),
+                    location=render_location(item['location'], item['floor'], indent + 2), notes=notes);
+
+    return output;
+
+
+def render_html(program, indent = None):
+    global printJSInline;
+    global printIndent;
+
+    if indent is None:
+        indent = printIndent;
+
+    blankLine = render('event-separator', indent);
+
+    # start with workshop message
+    output = render('workshops-open', indent);
+    output += render_workshop_link(program['workshops'], indent + 2);
+    # print any events on the workshop days
+    for event in program['workshops']['events']:
+        output += blankLine;
+        output += render_event(event, True, program['timeZone'], indent + 2);
+    output += render('row-close', indent);
+
+    for day in program['days']:
+        output += blankLine;
+        output += render_jump_menu(program, indent);
+        output += render('day-open', indent, number=str(day['number']), day=make_html_safe(day['day']), date=make_html_safe(day['date']));
+        for event in day['events']:
+            output += blankLine;
+            # don't print days for main conference
+            output += render_event(event, False, program['timeZone'], indent + 2);
+        output += render('row-close', indent);
+    
+    output += render_jump_menu(program, indent);
+
+    if printJSInline:
+        output += blankLine;
+        output += render('script', indent);
+
+    return output;
 
 
 def print_all_events(indent):
+    print(render_html(build_program(), indent), end='');
+
+
+def ics_text(text):
+    text = text.strip();
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n');
+
+
+def ics_line(name, value):
+    # lines longer than 75 octets must be folded (RFC 5545, Section 3.1)
+    line = name + ':' + value;
+    encoded = line.encode('utf8');
+    if len(encoded) <= 75:
+        return line + '\r\n';
+
+    folded = '';
+    current = '';
+    currentLength = 0;
+    limit = 75;
+    for char in line:
+        charLength = len(char.encode('utf8'));
+        if currentLength + charLength > limit:
+            folded += current + '\r\n ';
+            current = '';
+            currentLength = 0;
+            limit = 74;
+        current += char;
+        currentLength += charLength;
+
+    return folded + current + '\r\n';
+
+
+def ics_datetime(day, time):
+    global workshopDates;
+    global conferenceDates;
+    global calendarYear;
+
+    if day in conferenceDates:
+        date = conferenceDates[day];
+    elif day in workshopDates:
+        date = workshopDates[day];
+    else:
+        return None;
+
+    try:
+        parsed = datetime.datetime.strptime(date + ' ' + str(calendarYear) + ' ' + time.strip(), '%B %d %Y %I:%M %p');
+    except ValueError:
+        return None;
+
+    return parsed;
+
+
+def ics_utc(localTime):
+    global calendarTimeZone;
+
+    # times are written in UTC, so no VTIMEZONE definition is needed for the feed
+    return localTime.replace(tzinfo=zoneinfo.ZoneInfo(calendarTimeZone)).astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ');
+
+
+def ics_uid(*parts):
+    global calendarUIDDomain;
+
+    # UIDs only depend on what an entry is, not on when or where it is,
+    #   so calendar clients update moved entries instead of duplicating them
+    return hashlib.sha1('|'.join(parts).encode('utf8')).hexdigest()[:20] + '@' + calendarUIDDomain;
+
+
+def ics_location(location):
+    global locationFloors;
+
+    if location == "" or location == "other":
+        return "";
+    if location in locationFloors and locationFloors[location] != "":
+        return location + ' (' + locationFloors[location] + ')';
+    return location;
+
+
+def ics_event(uid, start, end, summary, location, description):
+    yield 'BEGIN:VEVENT\r\n';
+    yield ics_line('UID', uid);
+    yield ics_line('DTSTAMP', datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ'));
+    yield ics_line('DTSTART', ics_utc(start));
+    yield ics_line('DTEND', ics_utc(end));
+    yield ics_line('SUMMARY', ics_text(summary));
+    if location != "":
+        yield ics_line('LOCATION', ics_text(location));
+    if description != "":
+        yield ics_line('DESCRIPTION', ics_text(description));
+    yield 'END:VEVENT\r\n';
+
+
+def ics_session_description(sessionID):
+    global sessionInfo;
+    global sessionPapers;
+    global paperAuthorsByTitle;
+
+    lines = [];
+    if sessionID in sessionInfo and sessionInfo[sessionID]['Chair'] != "":
+        chair = 'Session Chair: ' + sessionInfo[sessionID]['Chair'];
+        if sessionInfo[sessionID]['Affiliation'] != "":
+            chair += ' (' + sessionInfo[sessionID]['Affiliation'] + ')';
+        lines.append(chair + '\n');
+
+    for paper in sessionPapers.get(sessionID, []):
+        if paper in paperAuthorsByTitle:
+            lines.append(paper + '\n' + paperAuthorsByTitle[paper]);
+        else:
+            lines.append(paper);
+
+    return '\n'.join(lines);
+
+
+def ics_keynote_description(keynoteID):
+    global keynoteDetails;
+
+    if keynoteID not in keynoteDetails:
+        return "";
+
+    details = keynoteDetails[keynoteID];
+    lines = [];
+    if details['Speaker'] != "":
+        speaker = 'Speaker: ' + details['Speaker'];
+        if details['Affiliation'] != "":
+            speaker += ' (' + details['Affiliation'] + ')';
+        lines.append(speaker);
+    if details['Abstract'] != "":
+        lines.append(details['Abstract']);
+    if details['Bio'] != "":
+        lines.append('Bio: ' + details['Bio']);
+
+    return '\n\n'.join(lines);
+
+
+def event_occurrence(occurrences, day, name):
+    # repeated events (e.g., coffee breaks) are told apart by how often they occur that day
+    key = (day, name);
+    occurrences[key] = occurrences.get(key, 0) + 1;
+    return occurrences[key];
+
+
+def collect_calendar_entries():
     global eventDay;
     global eventType;
     global eventStart;
@@ -625,117 +972,529 @@ def print_all_events(indent):
     global eventNames;
     global eventLocations;
     global eventNotes;
+    global sessionInfo;
+    global keynoteDetails;
 
-    global workshopDates;
-    global conferenceDates;
+    # returns (feed, uid, start, end, summary, location, description) for every entry,
+    #   where feed names the per-session or per-keynote feed (or None)
+    entries = [];
+    occurrences = {};
 
-    global printJSInline;
+    for event in range(len(eventDay)):
+        start = ics_datetime(eventDay[event], eventStart[event]);
+        end = ics_datetime(eventDay[event], eventEnd[event]);
+        if start is None or end is None:
+            print("  **ERROR**: Cannot determine date/time of " + eventDay[event] + " " + eventStart[event] + "; skipped in calendar", file=sys.stderr);
+            continue;
+
+        for i in range(len(eventNames[event])):
+            name = eventNames[event][i];
+            location = ics_location(eventLocations[event][i]);
+
+            if name[0:8].lower() == "session ":
+                sessionID = name[8:];
+                summary = 'Session ' + sessionID;
+                if sessionID in sessionInfo and sessionInfo[sessionID]['Title'] != "":
+                    summary += ': ' + sessionInfo[sessionID]['Title'];
+                entries.append(('session-' + sessionID, ics_uid('session', sessionID), start, end, summary, location, ics_session_description(sessionID)));
+            elif eventType[event].lower() == "keynote":
+                summary = html_to_text(name);
+                if name in keynoteDetails:
+                    if keynoteDetails[name]['Title'] != "":
+                        summary += ': ' + keynoteDetails[name]['Title'];
+                    if keynoteDetails[name]['Speaker'] != "":
+                        summary += ' by ' + keynoteDetails[name]['Speaker'];
+                description = ics_keynote_description(name);
+                if eventNotes[event] != "":
+                    description = (description + '\n\n' + html_to_text(eventNotes[event])).strip();
+                entries.append((name, ics_uid('keynote', name), start, end, summary, location, description));
+            else:
+                occurrence = event_occurrence(occurrences, eventDay[event], name);
+                entries.append((None, ics_uid('event', eventDay[event], name, str(occurrence)), start, end, html_to_text(name), location, html_to_text(eventNotes[event])));
 
-    pre = generate_indent(indent);
+    return entries;
 
-    event = 0;
 
-    # start with workshop message
-    print(pre + '<a class="anchor" id="workshops"></a>');
-    print(pre + '<div class="row schedule container-pad-top">');
-    print_workshop_link(indent + 2);
-    # print any events on the workshop days
-    while event < len(eventDay) and eventDay[event] in workshopDates:
-        print(pre);
-        print_event(eventDay[event], eventType[event], eventStart[event], eventEnd[event], eventNames[event], eventLocations[event], eventNotes[event], indent + 2);
-        event = event + 1;
-    print(pre + '</div>');
-    print(pre);
-    print(pre + '<hr />');
+def collect_paper_entries(sessionID, start, end, location):
+    global sessionPapers;
+    global paperAuthorsByTitle;
+    global paperIDByTitle;
+    global paperLength;
+
+    # papers are assumed to be presented back to back, paperLength minutes each
+    entries = [];
+    paperStart = start;
+
+    for paper in sessionPapers.get(sessionID, []):
+        paperEnd = min(paperStart + datetime.timedelta(minutes=paperLength), end);
+        if paperStart >= end:
+            break;
+        # keyed by paper ID when there is one, so a retitled paper keeps its UID
+        if paper in paperIDByTitle:
+            uid = ics_uid('paper', paperIDByTitle[paper]);
+        else:
+            uid = ics_uid('paper-title', paper);
+        entries.append((uid, paperStart, paperEnd, paper, location, paperAuthorsByTitle.get(paper, "")));
+        paperStart = paperEnd;
 
-    # for day, date in workshopDates.items():
-    currentDay = 0;
-    for day, date in conferenceDates.items():
-        print(pre);
-        print_jump_menu(indent);
-        currentDay = currentDay + 1;
-        print(pre + '<a class="anchor" id="day' + str(currentDay) + '"></a>');
-        print(pre + '<div class="row schedule">');
-        print(pre + '  <div class="col-xs-12">');
-        print(pre + '    <h2>Day ' + str(currentDay) + ': ' + make_html_safe(day) + ', ' + make_html_safe(date) + '</h2>');
-        print(pre + '  </div>');
-        while event < len(eventDay) and eventDay[event] == day:
-            print(pre);
-            # don't print days for main conference
-            print_event("", eventType[event], eventStart[event], eventEnd[event], eventNames[event], eventLocations[event], eventNotes[event], indent + 2);
-            event = event + 1;
-        print(pre + '</div>');
-        print(pre);
-        print(pre + '<hr />');
-    
-    print_jump_menu(indent);
+    return entries;
 
-    if printJSInline:
-        print(pre);
-        print(pre + "<script>");
-        print(pre + "function findBootstrapEnvironment() {");
-        print(pre + "    var envs = ['xs', 'sm', 'md', 'lg'];");
-        print(pre);
-        print(pre + "    var $el = $('<div>');");
-        print(pre + "    $el.appendTo($('body'));");
-        print(pre);
-        print(pre + "    for (var i = envs.length - 1; i >= 0; i--) {");
-        print(pre + "	var env = envs[i];");
-        print(pre)
-        print(pre + "	$el.addClass('hidden-'+env);");
-        print(pre + "	if ($el.is(':hidden')) {");
-        print(pre + "	    $el.remove();");
-        print(pre + "	    return env;");
-        print(pre + "	}");
-        print(pre + "    }");
-        print(pre + "}");
-        print(pre);
-        print(pre + "function collapseSessionsOnMobile() {");
-        print(pre + "  if(findBootstrapEnvironment() == 'xs') {");
-        print(pre + "    jQuery('div .panel-paper').collapse('hide');");
-        print(pre + "    jQuery('div .panel-keynote').collapse('hide');");
-        print(pre + "  }");
-        print(pre + "}");
-        print(pre);
-        print(pre + "function collapseSessionsOnAll() {");
-        print(pre + "  jQuery('div .panel-paper').collapse('hide');");
-        print(pre + "  jQuery('div .panel-keynote').collapse('hide');");
-        print(pre + "}");
-        print(pre);
-        print(pre + "function expandSessionsOnMobile() {");
-        print(pre + "  if(findBootstrapEnvironment() == 'xs') {");
-        print(pre + "    jQuery('div .panel-paper').collapse('show');");
-        print(pre + "    jQuery('div .panel-keynote').collapse('show');");
-        print(pre + "  }");
-        print(pre + "}");
-        print(pre);
-        print(pre + "function expandSessionsOnAll() {");
-        print(pre + "  jQuery('div .panel-paper').collapse('show');");
-        print(pre + "  jQuery('div .panel-keynote').collapse('show');");
-        print(pre + "}");
-        print(pre + "</script>");
+
+def ics_feed_lines(name, entries):
+    global calendarTimeZone;
+
+    yield 'BEGIN:VCALENDAR\r\n';
+    yield 'VERSION:2.0\r\n';
+    yield 'PRODID:-//conf-program-generator//gensched.py//EN\r\n';
+    yield 'CALSCALE:GREGORIAN\r\n';
+    yield ics_line('X-WR-CALNAME', ics_text(name));
+    yield ics_line('X-WR-TIMEZONE', calendarTimeZone);
+    for uid, start, end, summary, location, description in entries:
+        yield from ics_event(uid, start, end, summary, location, description);
+    yield 'END:VCALENDAR\r\n';
+
+
+def ics_content_hash(lines):
+    # DTSTAMP changes on every run, so it is left out when checking whether a feed changed
+    contentHash = hashlib.sha1();
+    for line in lines:
+        if not line.startswith('DTSTAMP'):
+            contentHash.update(line.encode('utf8'));
+
+    return contentHash.hexdigest();
+
+
+def write_ics_feed(filename, name, entries):
+    # stream the feed to a temporary file, and only replace the existing feed
+    #   if something other than DTSTAMP changed, so clients see only real changes
+    tempFilename = filename + '.tmp';
+    contentHash = hashlib.sha1();
+
+    try:
+        with open(tempFilename, mode = "w", encoding="utf8", newline='') as icsFile:
+            for line in ics_feed_lines(name, entries):
+                if not line.startswith('DTSTAMP'):
+                    contentHash.update(line.encode('utf8'));
+                icsFile.write(line);
+
+        if os.path.exists(filename):
+            with open(filename, mode = "r", encoding="utf8", newline='') as icsFile:
+                if ics_content_hash(icsFile) == contentHash.hexdigest():
+                    return False;
+
+        os.replace(tempFilename, filename);
+        return True;
+    finally:
+        if os.path.exists(tempFilename):
+            os.remove(tempFilename);
+
+
+def ics_filename(name):
+    return re.sub(r'[^A-Za-z0-9_-]+', '-', name).strip('-').lower() + '.ics';
+
+
+def remove_stale_files(directory, listName, written):
+    # removes output left over from earlier runs (e.g., for a session that was
+    #   removed or renamed), so that nobody keeps seeing outdated entries;
+    #   only files listed by an earlier run are removed, since the directory
+    #   may hold other files (e.g., photo manifests or a saved state)
+    listFile = os.path.join(directory, listName);
+    numRemoved = 0;
+
+    if os.path.exists(listFile):
+        with open(listFile, mode = "r", encoding="utf8") as previousList:
+            for filename in previousList.read().splitlines():
+                if filename not in written and os.path.basename(filename) == filename and os.path.exists(os.path.join(directory, filename)):
+                    os.remove(os.path.join(directory, filename));
+                    numRemoved = numRemoved + 1;
+
+    with open(listFile, mode = "w", encoding="utf8") as currentList:
+        for filename in sorted(written):
+            currentList.write(filename + '\n');
+
+    return numRemoved;
+
+
+def write_all_calendars(directory):
+    global calendarName;
+    global calendarTimeZone;
+
+    try:
+        zoneinfo.ZoneInfo(calendarTimeZone);
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        print("  **ERROR**: Unknown calendarTimeZone '" + calendarTimeZone + "'; no calendar feeds written", file=sys.stderr);
+        return;
+
+    os.makedirs(directory, exist_ok=True);
+
+    entries = collect_calendar_entries();
+
+    feeds = OrderedDict();
+    feeds['program'] = (calendarName, []);
+
+    for feed, uid, start, end, summary, location, description in entries:
+        entry = (uid, start, end, summary, location, description);
+        feeds['program'][1].append(entry);
+
+        day = 'day-' + start.strftime('%A');
+        if day not in feeds:
+            feeds[day] = (calendarName + ': ' + start.strftime('%A'), []);
+        feeds[day][1].append(entry);
+
+        if feed is not None:
+            if feed not in feeds:
+                feeds[feed] = (calendarName + ': ' + summary, []);
+            feeds[feed][1].append(entry);
+            if feed.startswith('session-'):
+                feeds[feed][1].extend(collect_paper_entries(feed[8:], start, end, location));
+
+    numWritten = 0;
+    filenames = set();
+    for feed, (name, feedEntries) in feeds.items():
+        filenames.add(ics_filename(feed));
+        if write_ics_feed(os.path.join(directory, ics_filename(feed)), name, feedEntries):
+            numWritten = numWritten + 1;
+
+    numRemoved = remove_stale_files(directory, '.calendar-files', filenames);
+
+    print("STAT: " + str(numWritten) + " of " + str(len(feeds)) + " calendar feeds updated, " + str(numRemoved) + " removed in " + directory, file=sys.stderr);
+
+
+def build_author_index():
+    global eventDay;
+    global eventStart;
+    global eventEnd;
+    global eventNames;
+    global eventLocations;
+    global sessionInfo;
+    global sessionPapers;
+    global paperAuthorListByTitle;
+    global authorIndex;
+
+    authorIndex.clear();
+
+    for event in range(len(eventDay)):
+        for i in range(len(eventNames[event])):
+            if eventNames[event][i][0:8].lower() != "session ":
+                continue;
+
+            sessionID = eventNames[event][i][8:];
+            sessionTitle = sessionInfo[sessionID]['Title'] if sessionID in sessionInfo else "";
+
+            for paper in sessionPapers.get(sessionID, []):
+                for first, last, affiliation, email in paperAuthorListByTitle.get(paper, []):
+                    # the same person can use different affiliations across papers,
+                    #   so authors are matched by name and email instead
+                    name = (first + " " + last).strip();
+                    key = (name.lower(), email.strip().lower());
+                    if key not in authorIndex:
+                        authorIndex[key] = {'first': first, 'last': last, 'name': name, 'affiliation': affiliation, 'talks': []};
+                    authorIndex[key]['talks'].append(OrderedDict([
+                            ('title', paper),
+                            ('session', sessionID),
+                            ('sessionTitle', sessionTitle),
+                            ('day', eventDay[event]),
+                            ('start', eventStart[event]),
+                            ('end', eventEnd[event]),
+                            ('room', eventLocations[event][i])
+                            ]));
+
+    print("STAT: " + str(len(authorIndex)) + " presenting authors indexed", file=sys.stderr);
+
+
+def author_slugs():
+    global authorIndex;
+
+    slugs = {};
+    used = set();
+    for key, author in authorIndex.items():
+        slug = re.sub(r'[^a-z0-9]+', '-', html.unescape(author['name']).lower()).strip('-');
+        if slug == "":
+            slug = "author";
+        candidate = slug;
+        suffix = 2;
+        while candidate in used:
+            candidate = slug + '-' + str(suffix);
+            suffix = suffix + 1;
+        used.add(candidate);
+        slugs[key] = candidate;
+
+    return slugs;
+
+
+def render_author_entry(author, slug, indent):
+    global conferenceSchedulePage;
+    global sessionHTMLIDs;
+
+    talks = "";
+    for talk in author['talks']:
+        room = "";
+        if talk['room'] != "" and talk['room'] != "other":
+            room = ', ' + html_accent_replacement(talk['room']);
+        talks += render('author-index-talk', indent + 4, page=conferenceSchedulePage, htmlID=sessionHTMLIDs.get(talk['session'], ""),
+                sessionID=make_html_safe(talk['session']), day=make_html_safe(talk['day']), start=make_html_safe(talk['start']),
+                end=make_html_safe(talk['end']), room=room, title=make_html_safe(talk['title']));
+
+    return render('author-index-entry', indent, anchor=slug, name=make_html_safe(author['name']),
+            affiliation=make_html_safe(author['affiliation']), talks=talks);
+
+
+def write_author_json(filename, author):
+    record = OrderedDict([
+            ('name', author['name']),
+            ('affiliation', author['affiliation']),
+            ('talks', author['talks'])
+            ]);
+
+    with open(filename, mode = "w", encoding="utf8") as jsonFile:
+        json.dump(record, jsonFile, ensure_ascii=False, indent=2);
+
+
+def write_author_index(directory):
+    global authorIndex;
+    global printIndent;
+
+    os.makedirs(directory, exist_ok=True);
+
+    slugs = author_slugs();
+    keys = sorted(authorIndex.keys(), key=lambda key: (authorIndex[key]['last'].lower(), authorIndex[key]['first'].lower(), key));
+
+    for key in keys:
+        write_author_json(os.path.join(directory, slugs[key] + '.json'), authorIndex[key]);
+
+    entries = "".join(render_author_entry(authorIndex[key], slugs[key], printIndent + 2) for key in keys);
+    with open(os.path.join(directory, 'index.html'), mode = "w", encoding="utf8") as htmlFile:
+        htmlFile.write(render('author-index', printIndent, authors=entries));
+
+    numRemoved = remove_stale_files(directory, '.author-files', set(slugs[key] + '.json' for key in keys));
+
+    print("STAT: " + str(len(keys)) + " author pages written, " + str(numRemoved) + " removed in " + directory, file=sys.stderr);
+
+
+outputBackends = {
+        'html': render_html,
+        'markdown': render_markdown,
+        'latex': render_latex
+        };
+
+# settings read by the renderers that may be changed after import (e.g., by
+#   goldencheck.py), so they are passed to workers along with the program
+renderSettings = ['printIndent', 'printLocations', 'printJSInline'];
+
+
+def write_output(outputFormat, program, filename, templateFilename, settings):
+    # runs in a worker process; templates are reloaded since a freshly
+    #   started worker does not share the parent's compiled templates,
+    #   and a spawned worker only has the settings from confconfig.py
+    globals().update(settings);
+    if outputFormat == 'html':
+        load_templates(templateFilename);
+
+    output = outputBackends[outputFormat](program);
+
+    if filename == '-':
+        return output;
+
+    with open(filename, mode = "w", encoding="utf8") as outputFile:
+        outputFile.write(output);
+    return None;
+
+
+def write_all_outputs(program, outputs, templateFilename, parallel = False):
+    # outputs is a list of (format, filename); '-' writes to standard output
+    settings = OrderedDict((name, globals()[name]) for name in renderSettings);
+    if len(outputs) == 1 or not parallel:
+        results = [write_output(outputFormat, program, filename, templateFilename, settings) for outputFormat, filename in outputs];
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(len(outputs), os.cpu_count() or 1)) as pool:
+            jobs = [pool.submit(write_output, outputFormat, program, filename, templateFilename, settings) for outputFormat, filename in outputs];
+            results = [job.result() for job in jobs];
+
+    for result in results:
+        if result is not None:
+            print(result, end='');
+
+
+def parse_output(option):
+    outputFormat, separator, filename = option.partition('=');
+    if outputFormat not in outputBackends:
+        raise argparse.ArgumentTypeError("unknown output format '" + outputFormat + "' (expected one of " + ', '.join(outputBackends) + ")");
+    if filename == "":
+        filename = '-';
+
+    return (outputFormat, filename);
+
+
+def clear_inputs():
+    # resets everything read from the input files, so that another
+    #   set of inputs can be read by the same process (see progdiff.py)
+    for data in [paperTitleByID, paperIDByTitle, paperAuthorsByTitle, paperLinksByTitle, paperAuthorListByTitle, authorIndex,
+            subsessionLabels, sessionLabels, sessionInfo, sessionPapers, sessionHTMLIDs, keynoteDetails, keynoteHTMLIDs, keynotePhotoVariants,
+            eventDay, eventType, eventStart, eventEnd, eventNames, eventLocations, eventNotes, locationFloors]:
+        data.clear();
+
+
+def read_author_inputs(options):
+    if options.hotcrp is not None:
+        read_authors_hotcrp(options.hotcrp);
+    else:
+        read_authors(options.authors);
+
+
+# reader name -> (globals it needs from other readers, function reading it
+#   from the options, globals it fills in); each reader only fills in its own
+#   globals, and runs once the readers filling in the globals it needs are done
+inputReaders = OrderedDict([
+        ('authors', ([], read_author_inputs, ['paperTitleByID', 'paperIDByTitle', 'paperAuthorsByTitle', 'paperAuthorListByTitle'])),
+        # papers can be listed by ID
+        ('sessions', (['paperTitleByID'], lambda options: read_session(options.info, options.papers),
+                ['sessionInfo', 'sessionPapers', 'sessionHTMLIDs', 'sessionLabels', 'subsessionLabels'])),
+        ('keynotes', ([], lambda options: read_keynotes(options.keynotes), ['keynoteDetails', 'keynoteHTMLIDs'])),
+        ('schedule', ([], lambda options: read_schedule(options.schedule),
+                ['eventDay', 'eventType', 'eventStart', 'eventEnd', 'eventNames', 'eventLocations', 'eventNotes', 'locationFloors'])),
+        ('links', ([], lambda options: read_links(options.links), ['paperLinksByTitle']))
+        ]);
+
+
+class InputError(Exception):
+    pass;
+
+
+def input_dependencies():
+    # reader name -> readers that fill in the globals it needs
+    readerByVariable = {};
+    for name, (needed, reader, variables) in inputReaders.items():
+        for variable in variables:
+            readerByVariable[variable] = name;
+
+    dependencies = OrderedDict();
+    for name, (needed, reader, variables) in inputReaders.items():
+        dependencies[name] = [];
+        for variable in needed:
+            if variable not in readerByVariable:
+                raise ValueError("reader '" + name + "' needs '" + variable + "', which no reader fills in");
+            if readerByVariable[variable] not in dependencies[name]:
+                dependencies[name].append(readerByVariable[variable]);
+
+    return dependencies;
+
+
+def input_options(directory, hotcrp = None):
+    # options for reading the input set in a directory, under the default file names
+    options = argparse.Namespace(hotcrp=hotcrp);
+    for name, filename in inputFiles.items():
+        setattr(options, name, os.path.join(directory, filename));
+
+    return options;
+
+
+def input_size(options):
+    size = 0;
+    for filename in [options.hotcrp, options.authors, options.info, options.papers, options.keynotes, options.schedule, options.links]:
+        if filename is not None and os.path.exists(filename):
+            size = size + os.path.getsize(filename);
+
+    return size;
+
+
+def ready_readers(dependencies, finished, errors):
+    # returns the readers whose dependencies have all been read, and
+    #   marks readers whose dependencies could not be read as skipped
+    ready = [];
+    for name in inputReaders:
+        if name in finished or name in errors:
+            continue;
+        failed = [dependency for dependency in dependencies[name] if dependency in errors];
+        if failed != []:
+            errors[name] = "skipped, since " + ", ".join(failed) + " could not be read";
+            return ready_readers(dependencies, finished, errors);
+        if all(dependency in finished for dependency in dependencies[name]):
+            ready.append(name);
+
+    return ready;
+
+
+def read_all_inputs(options):
+    dependencies = input_dependencies();
+
+    # reports all readers that failed instead of stopping at the first;
+    #   the readers run one after another, since they are CPU-bound and
+    #   copying their results back from worker processes costs about as
+    #   much as the parsing
+    finished = set();
+    errors = {};
+
+    ready = ready_readers(dependencies, finished, errors);
+    while ready != []:
+        needed, reader, variables = inputReaders[ready[0]];
+        try:
+            reader(options);
+            finished.add(ready[0]);
+        except Exception as error:
+            errors[ready[0]] = type(error).__name__ + ": " + str(error);
+        ready = ready_readers(dependencies, finished, errors);
+
+    # readers caught in a dependency cycle never become ready
+    for name in inputReaders:
+        if name not in finished and name not in errors:
+            errors[name] = "never started, since its dependencies form a cycle";
+
+    if len(errors) > 0:
+        for name in inputReaders:
+            if name in errors:
+                print("  **ERROR**: Cannot read " + name + " (" + errors[name] + ")", file=sys.stderr);
+        raise InputError(str(len(errors)) + " of " + str(len(inputReaders)) + " inputs could not be read");
 
 
 def generate_schedule(options):
-    read_authors(options.authors);
-    read_session(options.info, options.papers);
-    read_keynotes(options.keynotes);
-    read_schedule(options.schedule);
-    read_links(options.links);
-    print_all_events(printIndent);
+    load_templates(options.template);
+    read_all_inputs(options);
+
+    if options.photos is not None:
+        keynotePhotoVariants.update(process_keynote_photos(keynoteDetails, os.path.dirname(os.path.abspath(options.keynotes)), options.photos));
+
+    program = build_program();
+    # rendering is only worth spreading over processes for large programs
+    parallel = input_size(options) >= parallelInputSize and (os.cpu_count() or 1) > 1;
+    write_all_outputs(program, options.output if options.output else [('html', '-')], options.template, parallel);
+
+    if options.ics is not None:
+        write_all_calendars(options.ics);
+
+    if options.author_index is not None:
+        build_author_index();
+        write_author_index(options.author_index);
+
+    if options.save_state is not None:
+        save_program_state(program, options.save_state);
 
 
 if __name__ == "__main__":
-    if sys.version_info[0] < 3:
-        raise Exception("This script is not compatible with Python < 3.0.");
+    if sys.version_info < (3, 9):
+        raise Exception("This script is not compatible with Python < 3.9.");
 
     parser = argparse.ArgumentParser();
-    parser.add_argument('-s', '--schedule', type=str, default='schedule.csv');
-    parser.add_argument('-i', '--info', type=str, default='session-info.csv');
-    parser.add_argument('-p', '--papers', type=str, default='session-papers.csv');
-    parser.add_argument('-a', '--authors', type=str, default='authors.csv');
-    parser.add_argument('-l', '--links', type=str, default='paper-links.csv');
-    parser.add_argument('-k', '--keynotes', type=str, default='keynotes.csv');
+    parser.add_argument('-s', '--schedule', type=str, default=inputFiles['schedule']);
+    parser.add_argument('-i', '--info', type=str, default=inputFiles['info']);
+    parser.add_argument('-p', '--papers', type=str, default=inputFiles['papers']);
+    parser.add_argument('-a', '--authors', type=str, default=inputFiles['authors']);
+    parser.add_argument('-j', '--hotcrp', type=str, default=None, help='HotCRP JSON export; replaces --authors');
+    parser.add_argument('-l', '--links', type=str, default=inputFiles['links']);
+    parser.add_argument('-k', '--keynotes', type=str, default=inputFiles['keynotes']);
+    parser.add_argument('-o', '--output', type=parse_output, action='append', metavar='FORMAT[=PATH]',
+            help='output to write (html, markdown, or latex); may be repeated, and large programs render formats in separate processes (default: html to standard output)');
+    parser.add_argument('-c', '--ics', type=str, default=None, help='directory to write iCalendar feeds into; feeds written there by an earlier run but not by this one are removed');
+    parser.add_argument('-x', '--author-index', type=str, default=None, help='directory to write the author index and per-author JSON files into; author files written there by an earlier run but not by this one are removed');
+    parser.add_argument('-P', '--photos', type=str, default=None, help='directory to write resized keynote photos into (requires Pillow)');
+    parser.add_argument('-S', '--save-state', type=str, default=None, help='file to save the program state into, for comparison with progdiff.py');
+    parser.add_argument('-t', '--template', type=str, default=None, help='markup template file; defaults to templateFile in confconfig.py');
     options = parser.parse_args();
 
-    generate_schedule(options);
+    if options.template is None:
+        options.template = os.path.join(os.path.dirname(os.path.abspath(__file__)), templateFile);
+
+    try:
+        generate_schedule(options);
+    except InputError as error:
+        print("**ERROR**: " + str(error), file=sys.stderr);
+        sys.exit(1);
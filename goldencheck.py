@@ -0,0 +1,853 @@
+# GOLDENCHECK.PY
+#
+# script to check that every way of rendering the schedule produces
+#   byte-identical output, before a faster code path replaces an old one
+#
+# three kinds of checks are run:
+#   - golden files: real input sets (--corpus) are rendered and compared
+#     against output recorded earlier with --record
+#   - render modes: real and randomly generated input sets are rendered
+#     by each mode in renderModes and compared against the reference
+#     renderer, a frozen copy of the original read_authors and print_*
+#     functions
+#   - functions: the text cleanup functions are compared against frozen
+#     copies of their original implementations on random strings
+
+import io
+import os
+import sys
+import csv
+import html
+import json
+import string
+import random
+import difflib
+import argparse
+import tempfile
+import contextlib
+from collections import OrderedDict
+
+import gensched
+import affilclean
+
+
+#
+# reference implementations, frozen; do not optimize these
+#
+
+def reference_html_accent_replacement(text):
+    newText = '';
+
+    for char in text:
+        if char not in referenceRawCodes:
+            newText = newText + char;
+        else:
+            newText  = newText + referenceHTMLCodes[referenceRawCodes.index(char)];
+
+    return newText;
+
+
+def reference_clean_affil(affil):
+    affil = affil.strip();
+
+    if affil in referenceAffiliationChanges:
+        affil = referenceAffiliationChanges[affil];
+    else:
+        for old, new in referenceAbbreviations.items():
+            affil = affil.replace(old, new);
+
+    return affil;
+
+
+# the original author reader; the other readers are unchanged from the original
+
+def reference_read_authors(filename):
+    with open(filename, mode = "r") as csvFile:
+        authorFile = csv.reader(csvFile);
+
+        # skip header row
+        next(authorFile);
+
+        currentPaper = "";
+        currentAffiliation = "";
+        paperTitle = "";
+        paperAuthors = "";
+
+        for row in authorFile:
+            if currentPaper != row[0]:
+                if currentPaper != "":
+                    if currentAffiliation != "":
+                        paperAuthors += " (" + currentAffiliation + ")";
+
+                    # print("Title: " + paperTitle);
+                    # print("Authors: " + paperAuthors + '\n');
+
+                    if currentPaper in gensched.paperTitleByID:
+                        print("ERROR: Duplicate ID " + currentPaper, file=sys.stderr);
+                    else:
+                        gensched.paperTitleByID[currentPaper] = paperTitle;
+
+                    if paperTitle in gensched.paperAuthorsByTitle:
+                        print("ERROR: Duplicate Title '" + paperTitle + "'", file=sys.stderr);
+                    else:
+                        gensched.paperAuthorsByTitle[paperTitle] = paperAuthors;
+
+                currentPaper = row[0];
+                paperTitle = row[1];
+                paperAuthors = "";
+                currentAffiliation = "";
+            
+            if len(row) > 6 and row[7] == "nonauthor":
+                continue;
+
+            cleanedAffiliation = reference_clean_affil(row[5]);
+            if cleanedAffiliation == "":
+                cleanedAffiliation = "unaffiliated";
+
+            if paperAuthors != "":
+                if currentAffiliation != cleanedAffiliation:
+                    paperAuthors += " (" + currentAffiliation + "); ";
+                else:
+                    paperAuthors += ", ";
+
+            currentAffiliation = cleanedAffiliation;
+            paperAuthors += row[2] + " " + row[3]
+        
+        if currentPaper != "":
+            if currentAffiliation != "":
+                paperAuthors += " (" + currentAffiliation + ")";
+
+            # print("Title: " + paperTitle);
+            # print("Authors: " + paperAuthors + '\n');
+
+            if currentPaper in gensched.paperTitleByID:
+                print("ERROR: Duplicate ID " + currentPaper, file=sys.stderr);
+            else:
+                gensched.paperTitleByID[currentPaper] = paperTitle;
+
+            if paperTitle in gensched.paperAuthorsByTitle:
+                print("ERROR: Duplicate Title '" + paperTitle + "'", file=sys.stderr);
+            else:
+                gensched.paperAuthorsByTitle[paperTitle] = paperAuthors;
+    
+    print("STAT: " + str(len(gensched.paperAuthorsByTitle)) + " papers in " + filename, file=sys.stderr);
+
+
+# the original renderer, which prints the schedule from the globals that
+#   gensched's readers fill in
+
+def reference_make_html_safe(text):
+    return reference_html_accent_replacement(html.escape(text)).strip();
+
+
+def reference_generate_indent(indent):
+    pre = "";
+    for i in range(indent):
+        pre = pre + " ";
+
+    return pre;
+
+
+def reference_get_map(location):
+    if location in gensched.mapPaths:
+        return gensched.mapPaths[location];
+    elif '-default-' in gensched.mapPaths:
+        return gensched.mapPaths['-default-'];
+    return '';
+
+
+def reference_format_media_link(label, url):
+    css = 'fa-solid fa-link';
+    if label == 'Paper':
+        css = 'fa-solid fa-file';
+    elif label == 'Video':
+        css = 'fa-solid fa-video';
+    elif label == 'Lightning Talk':
+        css = 'fa-solid fa-video';
+    elif label == 'Session Lightning Talks':
+        css = 'fa-solid fa-video';
+    elif label == 'Slides':
+        css = 'fa-solid fa-chalkboard-user';
+
+    return '<a href="' + url + '"><span class="' + css + '"></span> ' + reference_make_html_safe(label) + '</a>';
+
+
+def reference_print_location(location, indent):
+    pre = reference_generate_indent(indent);
+
+    if gensched.printLocations and location != "" and location != "other":
+        print(pre + '<h5 class="session-location">');
+        print(pre + '  Location: ' + reference_html_accent_replacement(location));
+        if location in gensched.locationFloors:
+            locationMap = reference_get_map(location);
+            print(pre + '  <span class="session-floor">(', end='');
+            if locationMap != '':
+                print('<a href="' + locationMap + '">', end='');
+            print('' + reference_html_accent_replacement(gensched.locationFloors[location]), end='');
+            if locationMap != '':
+                print('</a>', end='');
+            print(')</span>');
+        print(pre + '</h5>');
+
+
+def reference_print_session(sessionID, htmlID, location, width, indent):
+    pre = reference_generate_indent(indent);
+
+    print(pre + '<div class="schedule-session col-xs-12 col-md-' + str(width) + '">');
+    print(pre + '  <div class="panel panel-default panel-session">');
+    print(pre + '    <div class="panel-heading" role="tab" id="title-' + htmlID + '">');
+    print(pre + '      <h4 class="panel-title">')
+    print(pre + '        <a role="button" data-toggle="collapse" href="#' + htmlID + '" aria-expanded="true" aria-controls="' + htmlID + '">');
+    print(pre + '          Session ' + reference_make_html_safe(sessionID), end='');
+    if gensched.sessionInfo[sessionID]['Title'] != "":
+        print(': ' + reference_make_html_safe(gensched.sessionInfo[sessionID]['Title']));
+    else:
+        print();
+    print(pre + '        </a>');
+    print(pre + '      </h4>');
+    reference_print_location(location, indent + 6);
+    print(pre + '    </div>');
+    print(pre);
+
+    print(pre + '    <div id="' + htmlID + '" class="panel-collapse panel-paper collapse in" role="tabpanel" aria-labelledby="title-' + htmlID + '">');
+    print(pre + '      <div class="panel-body">');
+
+    if gensched.sessionInfo[sessionID]['Chair'] != "":
+        print(pre + '        <div class="session-chair">');
+        print(pre + '          Session Chair: ' + reference_make_html_safe(gensched.sessionInfo[sessionID]['Chair']), end='');
+        if gensched.sessionInfo[sessionID]['Affiliation'] != "":
+            print(' <span class="affiliation">(' + reference_make_html_safe(gensched.sessionInfo[sessionID]["Affiliation"]) + ')</span>', end='');
+        print('\n' + pre + '        </div>');
+
+    if gensched.sessionInfo[sessionID]['Lightning Talks'] != "":
+        print(pre + '        <div class="session-links">');
+        print(pre + '          ' + reference_format_media_link('Session Lightning Talks', gensched.sessionInfo[sessionID]['Lightning Talks']));
+        print(pre + '        </div>');
+
+    separator = "";
+
+    for paper in gensched.sessionPapers[sessionID]:
+        print(separator + pre + '        <div class="paper">');
+        # TODO: add paper times
+        # TODO: add best paper flags
+        print(pre + '          <div class="paper-title">');
+        print(pre + '            ' + reference_make_html_safe(paper));
+        print(pre + '          </div>');
+        if paper in gensched.paperAuthorsByTitle:
+            print(pre + '          <div class="paper-authors">');
+            print(pre + '            ' + reference_make_html_safe(gensched.paperAuthorsByTitle[paper]));
+            print(pre + '          </div>');
+        else:
+            print("  **ERROR**: Title '" + paper + "' in Session " + sessionID + " not found. Was the title updated?", file=sys.stderr);
+        if paper in gensched.paperLinksByTitle:
+            linksStarted = False;
+            linkSeparator = "";
+            for key, value in gensched.paperLinksByTitle[paper].items():
+                if value == "":
+                    continue;
+                if not linksStarted:
+                    linksStarted = True;
+                    print(pre + '          <div class="paper-links">');
+                print(linkSeparator + pre + '            ' + reference_format_media_link(key, value));
+                linkSeparator = pre + '            &bull;\n';
+            if linksStarted:
+                print(pre + '          </div>');
+        print(pre + '        </div>');
+        separator = pre + '        <hr />\n';
+    
+    print(pre + '      </div>');
+    print(pre + '    </div>');
+    print(pre + '  </div>');
+    print(pre + '</div>');
+
+
+def reference_print_keynote(keynoteID, htmlID, location, indent):
+    pre = reference_generate_indent(indent);
+
+    print(pre + '<div class="schedule-session col-xs-12">');
+    print(pre + '  <div class="panel panel-default panel-session panel-highlight">');
+    print(pre + '    <div class="panel-heading" role="tab" id="title-k-' + htmlID + '">');
+    print(pre + '      <h4 class="panel-title">')
+    print(pre + '        <a role="button" data-toggle="collapse" href="#k-' + htmlID + '" aria-expanded="true" aria-controls="k-' + htmlID + '">');
+    if gensched.keynoteDetails[keynoteID]["Title"] != "":
+        print(pre + '          ' + reference_make_html_safe(gensched.keynoteDetails[keynoteID]["Title"]));
+    else:
+        print(pre + '          Title TBA');
+    print(pre + '        </a>');
+    print(pre + '      </h4>');
+    reference_print_location(location, indent + 6);
+    print(pre + '    </div>');
+    print(pre);
+
+    print(pre + '    <div id="k-' + htmlID + '" class="panel-collapse panel-keynote collapse" role="tabpanel" aria-labelledby="title-k-' + htmlID + '">');
+    print(pre + '      <div class="panel-body">');
+
+    print(pre + '        <p>');
+    if gensched.keynoteDetails[keynoteID]["Photo URL"] != "":
+        print(pre + '          <img src="' + gensched.keynoteDetails[keynoteID]["Photo URL"] + '" alt="' + gensched.keynoteDetails[keynoteID]["Speaker"] + ' headshot" class="speaker-photo" />');
+    if gensched.keynoteDetails[keynoteID]["Abstract"] != "":
+        print(pre + '          <b>Abstract</b><br/>');
+        print(pre + '          ' + reference_make_html_safe(gensched.keynoteDetails[keynoteID]["Abstract"]).replace('\n', '<br/>'));
+    else:
+        print(pre + '          Abstract TBA');
+    print(pre + '        </p>');
+    linksStarted = False;
+    linkSeparator = "";
+    for key, value in gensched.keynoteDetails[keynoteID]['Links'].items():
+        if value == "":
+            continue;
+        if not linksStarted:
+            linksStarted = True;
+            print(pre + '        <div class="keynote-links">');
+        print(linkSeparator + pre + '          ' + reference_format_media_link(key, value));
+        linkSeparator = pre + '          &bull;\n';
+    if linksStarted:
+        print(pre + '        </div>');
+
+    if gensched.keynoteDetails[keynoteID]["Bio"] != "":
+        print(pre + '        <hr />');
+        print(pre + '        <p>');
+        print(pre + '          <b>Bio</b><br/>');
+        print(pre + '          ' + reference_make_html_safe(gensched.keynoteDetails[keynoteID]["Bio"]).replace('\n', '<br/>'));
+        print(pre + '        </p>');
+
+    
+    print(pre + '      </div>');
+    print(pre + '    </div>');
+    print(pre + '  </div>');
+    print(pre + '</div>');
+
+
+def reference_print_jump_menu(indent):
+    pre = reference_generate_indent(indent);
+
+    # TODO: add support for "Jump to Today" link
+
+    print(pre + '<div class="row schedule">');
+    print(pre + '  <div class="col-xs-12 text-center">');
+    print(pre + '    Jump to');
+    print(pre + '    <a href="' + gensched.conferenceSchedulePage + '#workshops">' + reference_make_html_safe(gensched.workshopDaysAbbr) + '</a>', end = '');
+
+    numConferenceDays = 1;
+    for day, date in gensched.conferenceDates.items():
+        print(' |');
+        print(pre + '    <a href="' + gensched.conferenceSchedulePage + '#day' + str(numConferenceDays) + '">' + reference_make_html_safe(day) + '</a>', end = '');
+        numConferenceDays = numConferenceDays + 1;
+    print();
+
+    print(pre + '    <br/><br/>');
+    print(pre + '    <a href="#" onclick="expandSessionsOnAll(); return false;">Expand All</a> / ');
+    print(pre + '    <a href="#" onclick="collapseSessionsOnAll(); return false;">Collapse All</a> Sessions');
+    print(pre + '  </div>');
+    print(pre + '</div>');
+    print(pre);
+    print(pre + '<hr />');
+    print(pre);
+
+
+def reference_print_workshop_link(indent):
+    pre = reference_generate_indent(indent);
+
+    print(pre + '<div class="col-xs-12">');
+    print(pre + '  <h2><a href="' + gensched.workshopSchedulePage + '">', end='');
+    separator = '';
+    for day, date in gensched.workshopDates.items():
+        print(separator + reference_make_html_safe(day) + ', ' + reference_make_html_safe(date), end='');
+        separator = ' / ';
+    print(': Workshops &amp; Tutorials</a></h2>');
+    print(pre + '</div>');
+
+
+def reference_print_event(day, eventType, start, end, names, locations, notes, indent):
+    pre = reference_generate_indent(indent);
+
+    eventIndices = [];
+    sessionNames = OrderedDict();
+    
+    for i in range(len(names)):
+        if names[i][0:8].lower() == "session ":
+            sessionNames[names[i][8:]] = locations[i];
+        else:
+            eventIndices.append(i);
+
+    separator = "";
+
+    typeFormat = "";
+    if eventType.lower() in ["meal", "break"]:
+        typeFormat = "secondary-event ";
+
+    if len(sessionNames) > 0:
+        print(pre + '<div class="schedule-time ' + typeFormat + 'col-xs-12">');
+        print(pre + '  <h3>', end='');
+        if day != "":
+            print(reference_make_html_safe(day) + ', ', end='');
+        print(reference_make_html_safe(start) + ' <span class="zone-name">' + reference_make_html_safe(gensched.timeZone) + '</span> &ndash; ' + reference_make_html_safe(end) + ' <span class="zone-name">' + reference_make_html_safe(gensched.timeZone) + '</span></h3>');
+        if notes != "":
+            print(pre + '  <ul class="h5 session-notes">');
+            for note in notes.split('\n'):
+                print(pre + '    <li>' + reference_html_accent_replacement(note) + '</li>');
+            print(pre + '  </ul>');
+        print(pre + '</div>');
+        for session, location in sessionNames.items():
+            print(pre);
+            reference_print_session(session, gensched.sessionHTMLIDs[session], location, int(12 / len(sessionNames)), indent);
+        separator = pre + '\n';
+
+    for i in eventIndices:
+        print(separator, end='');
+        separator = pre + '\n';
+        print(pre + '<div class="schedule-time ' + typeFormat + 'col-xs-12">');
+        print(pre + '  <h3>', end='');
+        if day != "":
+            print(day + ', ', end='');
+        if eventType.lower() in ["keynote"]:
+            print();
+            print(pre + '    ' + reference_make_html_safe(start) + ' <span class="zone-name">' + reference_make_html_safe(gensched.timeZone) + '</span> &ndash; ' + reference_make_html_safe(end) + ' <span class="zone-name">' + reference_make_html_safe(gensched.timeZone) + '</span>:');
+            print(pre + '    ' + reference_html_accent_replacement(names[i]), end='');
+            if names[i] in gensched.keynoteDetails.keys():
+                if gensched.keynoteDetails[names[i]]["Speaker"] != "":
+                    print(' by ' + reference_make_html_safe(gensched.keynoteDetails[names[i]]["Speaker"]));
+                    if gensched.keynoteDetails[names[i]]["Affiliation"] != "":
+                      print(pre + '    <span class="affiliation">(' + reference_make_html_safe(gensched.keynoteDetails[names[i]]["Affiliation"]) + ')</span>');
+                else:
+                    print();
+            print(pre + '  </h3>');
+            if notes != "":
+                print(pre + '  <ul class="h5 session-notes">');
+                for note in notes.split('\n'):
+                    print(pre + '    <li>' + reference_html_accent_replacement(note) + '</li>');
+                print(pre + '  </ul>');
+            print(pre + '</div>');
+            reference_print_keynote(names[i], gensched.keynoteHTMLIDs[names[i]], locations[i], indent);
+        else:
+            print(reference_make_html_safe(start) + ' <span class="zone-name">' + reference_make_html_safe(gensched.timeZone) + '</span> &ndash; ' + reference_make_html_safe(end) + ' <span class="zone-name">' + reference_make_html_safe(gensched.timeZone) + '</span>: ' + reference_html_accent_replacement(names[i]) + '</h3>');
+            reference_print_location(locations[i], indent + 2);
+            if notes != "":
+                print(pre + '  <ul class="h5 session-notes">');
+                for note in notes.split('\n'):
+                    print(pre + '    <li>' + reference_html_accent_replacement(note) + '</li>');
+                print(pre + '  </ul>');
+            print(pre + '</div>');
+
+
+def reference_print_all_events(indent):
+    pre = reference_generate_indent(indent);
+
+    event = 0;
+
+    # start with workshop message
+    print(pre + '<a class="anchor" id="workshops"></a>');
+    print(pre + '<div class="row schedule container-pad-top">');
+    reference_print_workshop_link(indent + 2);
+    # print any events on the workshop days
+    while event < len(gensched.eventDay) and gensched.eventDay[event] in gensched.workshopDates:
+        print(pre);
+        reference_print_event(gensched.eventDay[event], gensched.eventType[event], gensched.eventStart[event], gensched.eventEnd[event], gensched.eventNames[event], gensched.eventLocations[event], gensched.eventNotes[event], indent + 2);
+        event = event + 1;
+    print(pre + '</div>');
+    print(pre);
+    print(pre + '<hr />');
+
+    # for day, date in gensched.workshopDates.items():
+    currentDay = 0;
+    for day, date in gensched.conferenceDates.items():
+        print(pre);
+        reference_print_jump_menu(indent);
+        currentDay = currentDay + 1;
+        print(pre + '<a class="anchor" id="day' + str(currentDay) + '"></a>');
+        print(pre + '<div class="row schedule">');
+        print(pre + '  <div class="col-xs-12">');
+        print(pre + '    <h2>Day ' + str(currentDay) + ': ' + reference_make_html_safe(day) + ', ' + reference_make_html_safe(date) + '</h2>');
+        print(pre + '  </div>');
+        while event < len(gensched.eventDay) and gensched.eventDay[event] == day:
+            print(pre);
+            # don't print days for main conference
+            reference_print_event("", gensched.eventType[event], gensched.eventStart[event], gensched.eventEnd[event], gensched.eventNames[event], gensched.eventLocations[event], gensched.eventNotes[event], indent + 2);
+            event = event + 1;
+        print(pre + '</div>');
+        print(pre);
+        print(pre + '<hr />');
+    
+    reference_print_jump_menu(indent);
+
+    if gensched.printJSInline:
+        print(pre);
+        print(pre + "<script>");
+        print(pre + "function findBootstrapEnvironment() {");
+        print(pre + "    var envs = ['xs', 'sm', 'md', 'lg'];");
+        print(pre);
+        print(pre + "    var $el = $('<div>');");
+        print(pre + "    $el.appendTo($('body'));");
+        print(pre);
+        print(pre + "    for (var i = envs.length - 1; i >= 0; i--) {");
+        print(pre + "	var env = envs[i];");
+        print(pre)
+        print(pre + "	$el.addClass('hidden-'+env);");
+        print(pre + "	if ($el.is(':hidden')) {");
+        print(pre + "	    $el.remove();");
+        print(pre + "	    return env;");
+        print(pre + "	}");
+        print(pre + "    }");
+        print(pre + "}");
+        print(pre);
+        print(pre + "function collapseSessionsOnMobile() {");
+        print(pre + "  if(findBootstrapEnvironment() == 'xs') {");
+        print(pre + "    jQuery('div .panel-paper').collapse('hide');");
+        print(pre + "    jQuery('div .panel-keynote').collapse('hide');");
+        print(pre + "  }");
+        print(pre + "}");
+        print(pre);
+        print(pre + "function collapseSessionsOnAll() {");
+        print(pre + "  jQuery('div .panel-paper').collapse('hide');");
+        print(pre + "  jQuery('div .panel-keynote').collapse('hide');");
+        print(pre + "}");
+        print(pre);
+        print(pre + "function expandSessionsOnMobile() {");
+        print(pre + "  if(findBootstrapEnvironment() == 'xs') {");
+        print(pre + "    jQuery('div .panel-paper').collapse('show');");
+        print(pre + "    jQuery('div .panel-keynote').collapse('show');");
+        print(pre + "  }");
+        print(pre + "}");
+        print(pre);
+        print(pre + "function expandSessionsOnAll() {");
+        print(pre + "  jQuery('div .panel-paper').collapse('show');");
+        print(pre + "  jQuery('div .panel-keynote').collapse('show');");
+        print(pre + "}");
+        print(pre + "</script>");
+
+
+referenceHTMLCodes = ['&Aacute;', '&aacute;', '&Agrave;', '&Acirc;', '&agrave;', '&Acirc;', '&acirc;', '&Auml;', '&auml;', '&Atilde;', '&atilde;', '&Aring;', '&aring;', '&Aelig;', '&aelig;', '&Ccedil;', '&ccedil;', '&Eth;', '&eth;', '&Eacute;', '&eacute;', '&Egrave;', '&egrave;', '&Ecirc;', '&ecirc;', '&Euml;', '&euml;', '&Iacute;', '&iacute;', '&Igrave;', '&igrave;', '&Icirc;', '&icirc;', '&Iuml;', '&iuml;', '&Ntilde;', '&ntilde;', '&Oacute;', '&oacute;', '&Ograve;', '&ograve;', '&Ocirc;', '&ocirc;', '&Ouml;', '&ouml;', '&Otilde;', '&otilde;', '&Oslash;', '&oslash;', '&szlig;', '&Thorn;', '&thorn;', '&Uacute;', '&uacute;', '&Ugrave;', '&ugrave;', '&Ucirc;', '&ucirc;', '&Uuml;', '&uuml;', '&Yacute;', '&yacute;', '&yuml;', '&copy;', '&reg;', '&trade;', '&euro;', '&cent;', '&pound;', '&lsquo;', '&rsquo;', '&ldquo;', '&rdquo;', '&laquo;', '&raquo;', '&mdash;', '&ndash;', '&deg;', '&plusmn;', '&frac14;', '&frac12;', '&frac34;', '&times;', '&divide;', '&alpha;', '&beta;', '&infin;', '&Cacute;', '&cacute;'];
+referenceRawCodes = ['\xc1','\xe1','\xc0','\xc2','\xe0','\xc2','\xe2','\xc4','\xe4','\xc3','\xe3','\xc5','\xe5','\xc6','\xe6','\xc7','\xe7','\xd0','\xf0','\xc9','\xe9','\xc8','\xe8','\xca','\xea','\xcb','\xeb','\xcd','\xed','\xcc','\xec','\xce','\xee','\xcf','\xef','\xd1','\xf1','\xd3','\xf3','\xd2','\xf2','\xd4','\xf4','\xd6','\xf6','\xd5','\xf5','\xd8','\xf8','\xdf','\xde','\xfe','\xda','\xfa','\xd9','\xf9','\xdb','\xfb','\xdc','\xfc','\xdd','\xfd','\xff','\xa9','\xae','™','€','\xa2','\xa3','‘','’','“','”','\xab','\xbb','—','–','\xb0','\xb1','\xbc','\xbd','\xbe','\xd7','\xf7','α','β','∞', 'Ć', 'ć'];
+
+# the affiliation tables are data, not code, so the current tables are used
+referenceAffiliationChanges = affilclean.affiliation_changes;
+referenceAbbreviations = affilclean.abbreviations;
+
+
+#
+# render modes; each one renders the input set in a directory into HTML
+#
+
+def read_program(options):
+    # progress and error messages from the readers are not part of the output
+    with contextlib.redirect_stderr(io.StringIO()):
+        gensched.clear_inputs();
+        gensched.read_all_inputs(options);
+        return gensched.build_program();
+
+
+def render_reference(directory):
+    options = gensched.input_options(directory);
+    with contextlib.redirect_stderr(io.StringIO()):
+        gensched.clear_inputs();
+        reference_read_authors(options.authors);
+        gensched.read_session(options.info, options.papers);
+        gensched.read_keynotes(options.keynotes);
+        gensched.read_schedule(options.schedule);
+        gensched.read_links(options.links);
+        output = io.StringIO();
+        with contextlib.redirect_stdout(output):
+            reference_print_all_events(gensched.printIndent);
+
+    return output.getvalue();
+
+
+def render_direct(directory):
+    return gensched.render_html(read_program(gensched.input_options(directory)));
+
+
+def render_stdout(directory):
+    with contextlib.redirect_stderr(io.StringIO()):
+        gensched.clear_inputs();
+        gensched.read_all_inputs(gensched.input_options(directory));
+        output = io.StringIO();
+        with contextlib.redirect_stdout(output):
+            gensched.print_all_events(gensched.printIndent);
+
+    return output.getvalue();
+
+
+def render_hotcrp(directory):
+    # only applies to input sets that also include a HotCRP export
+    hotcrpFile = os.path.join(directory, 'authors.json');
+    if not os.path.exists(hotcrpFile):
+        return None;
+
+    return gensched.render_html(read_program(gensched.input_options(directory, hotcrpFile)));
+
+
+def render_pool(directory):
+    program = read_program(gensched.input_options(directory));
+    with tempfile.TemporaryDirectory() as outputDirectory:
+        htmlFile = os.path.join(outputDirectory, 'program.html');
+        gensched.write_all_outputs(program, [('html', htmlFile), ('markdown', os.path.join(outputDirectory, 'program.md'))], templateFilename, True);
+        with open(htmlFile, mode = "r", encoding="utf8", newline='') as outputFile:
+            return outputFile.read();
+
+
+renderModes = OrderedDict([
+        ('reference', render_reference),
+        ('direct', render_direct),
+        ('stdout', render_stdout),
+        ('hotcrp', render_hotcrp),
+        ('pool', render_pool)
+        ]);
+
+referenceMode = 'reference';
+
+templateFilename = os.path.join(os.path.dirname(os.path.abspath(__file__)), gensched.templateFile);
+
+
+#
+# synthetic inputs
+#
+
+accentedChars = referenceRawCodes + ['&', '<', '>', '"', "'", 'Ł', 'å', '中'];
+
+words = ['Fast', 'Scalable', 'Memory', 'Cache', 'Coherence', 'Accelerating', 'Graph', 'Neural', 'Networks', 'Processing',
+        'in', 'for', 'with', 'Near-Data', 'Speculative', 'Secure', 'Enclaves', 'GPUs', 'Tensor', 'Sparse', 'DRAM', 'Flash'];
+
+names = ['Ada', 'Grace', 'Alan', 'Barbara', 'Edsger', 'Frances', 'John', 'Leslie', 'Margaret', 'Niklaus', 'Radia', 'Yale'];
+
+eventNames = ['Breakfast', 'Lunch', 'Coffee Break', 'Opening Remarks', 'Business Meeting', 'Poster Session',
+        'Excursion: <a href="https://example.org/">Museum</a>', 'Awards &amp; Closing'];
+
+
+def random_text(rng, wordList, minWords, maxWords):
+    text = ' '.join(rng.choice(wordList) for i in range(rng.randint(minWords, maxWords)));
+    if rng.random() < 0.3:
+        position = rng.randint(0, len(text));
+        text = text[:position] + rng.choice(accentedChars) + text[position:];
+
+    return text;
+
+
+def random_time(rng):
+    return str(rng.randint(1, 12)) + ':' + rng.choice(['00', '15', '20', '30', '40']) + ' ' + rng.choice(['AM', 'PM']);
+
+
+def random_affiliation(rng):
+    choice = rng.random();
+    if choice < 0.4:
+        return rng.choice(list(affilclean.affiliation_changes.keys()));
+    if choice < 0.5:
+        return "";
+    return random_text(rng, words + ['University', 'Institute', 'Systems', 'U.'], 1, 4);
+
+
+def write_csv(filename, rows):
+    with open(filename, mode = "w", encoding="utf8", newline='') as csvFile:
+        csv.writer(csvFile).writerows(rows);
+
+
+def generate_inputs(directory, rng):
+    rooms = ['Room A', 'Room B', 'Room C', 'Hall \xc9'];
+
+    # papers and their authors, in both authors.csv and HotCRP form
+    titles = [];
+    authorRows = [['paper', 'title', 'first', 'last', 'email', 'affiliation', 'country', 'iscontact']];
+    hotcrpPapers = [];
+    paperIDs = rng.sample(range(1, 1000), rng.randint(0, 40));
+    for paperID in paperIDs:
+        title = random_text(rng, words, 2, 8) + ' ' + str(paperID);
+        titles.append(title);
+        hotcrpAuthors = [];
+        for i in range(rng.randint(1, 5)):
+            first = random_text(rng, names, 1, 2);
+            last = random_text(rng, names, 1, 1);
+            affiliation = random_affiliation(rng);
+            email = first.lower().replace(' ', '.') + '@example.org';
+            nonauthor = rng.random() < 0.1;
+            authorRows.append([str(paperID), title, first, last, email, affiliation, 'USA', 'nonauthor' if nonauthor else 'yes']);
+            if not nonauthor:
+                hotcrpAuthors.append(OrderedDict([('first', first), ('last', last), ('email', email), ('affiliation', affiliation)]));
+        hotcrpPapers.append(OrderedDict([('pid', paperID), ('title', title), ('authors', hotcrpAuthors)]));
+
+    write_csv(os.path.join(directory, gensched.inputFiles['authors']), authorRows);
+    with open(os.path.join(directory, 'authors.json'), mode = "w", encoding="utf8") as jsonFile:
+        json.dump(hotcrpPapers, jsonFile, ensure_ascii=False);
+
+    # sessions: groups of up to four concurrent sessions, papers referenced by ID or by title
+    numSubsessions = [rng.randint(1, len(rooms)) for i in range(rng.randint(0, 6))];
+    paperRows = [['Session'] + ['A', 'B', 'C', 'D']];
+    infoRows = [['Session', 'Title', 'Chair', 'Affiliation', 'Lightning Talks']];
+    unassigned = list(range(len(paperIDs)));
+    rng.shuffle(unassigned);
+    for group in range(len(numSubsessions)):
+        label = str(group + 1);
+        paperRows.append([label] + ['Group ' + label + ' ' + subsession for subsession in 'ABCD'[:numSubsessions[group]]]);
+        columns = [[] for i in range(numSubsessions[group])];
+        for i in range(numSubsessions[group]):
+            for j in range(rng.randint(0, 4)):
+                if unassigned != []:
+                    paper = unassigned.pop();
+                    columns[i].append(str(paperIDs[paper]) if rng.random() < 0.5 else titles[paper]);
+                elif rng.random() < 0.2:
+                    columns[i].append('Unknown Title ' + str(j));
+            infoRows.append([label + 'ABCD'[i], random_text(rng, words, 0, 4), random_text(rng, names, 0, 2),
+                    random_affiliation(rng), 'https://example.org/lt/' + label if rng.random() < 0.3 else '']);
+        for j in range(max([len(column) for column in columns] + [0])):
+            paperRows.append([''] + [column[j] if j < len(column) else '' for column in columns]);
+    write_csv(os.path.join(directory, gensched.inputFiles['papers']), paperRows);
+    write_csv(os.path.join(directory, gensched.inputFiles['info']), infoRows);
+
+    linkRows = [['Title', 'Paper', 'Lightning Talk']];
+    for title in titles:
+        if rng.random() < 0.4:
+            linkRows.append([title, 'https://example.org/p' if rng.random() < 0.7 else '', 'https://example.org/lt' if rng.random() < 0.5 else '']);
+    write_csv(os.path.join(directory, gensched.inputFiles['links']), linkRows);
+
+    keynoteRows = [['Keynote', 'Speaker', 'Affiliation', 'Photo URL', 'Title', 'Abstract', 'Bio', 'Video', 'Slides']];
+    numKeynotes = rng.randint(0, 3);
+    for i in range(numKeynotes):
+        keynoteRows.append(['Keynote ' + str(i + 1), random_text(rng, names, 0, 2), random_affiliation(rng),
+                'https://example.org/photo.jpg' if rng.random() < 0.5 else '', random_text(rng, words, 0, 6),
+                '\n'.join(random_text(rng, words, 0, 12) for j in range(rng.randint(1, 3))), random_text(rng, words, 0, 10),
+                'https://example.org/v' if rng.random() < 0.5 else '', 'https://example.org/s' if rng.random() < 0.5 else '']);
+    write_csv(os.path.join(directory, gensched.inputFiles['keynotes']), keynoteRows);
+
+    # schedule: events for each workshop and conference day, in order
+    scheduleRows = [['Day', 'Type', 'Start', 'End'] + rooms + ['other', 'notes'], ['', '', '', ''] + ['Floor ' + str(i + 1) for i in range(len(rooms))] + ['', '']];
+    events = [];
+    for group in range(len(numSubsessions)):
+        events.append(('', ['Session ' + str(group + 1) + 'ABCD'[i] for i in range(numSubsessions[group])]));
+    for i in range(numKeynotes):
+        events.append(('keynote', ['Keynote ' + str(i + 1)]));
+    for i in range(rng.randint(0, 8)):
+        events.append((rng.choice(['meal', 'break', 'other', '']), [rng.choice(eventNames)]));
+    rng.shuffle(events);
+
+    days = list(gensched.workshopDates.keys()) + list(gensched.conferenceDates.keys());
+    for eventType, eventNamesInRow in events:
+        rowNames = eventNamesInRow + [''] * (len(rooms) - len(eventNamesInRow));
+        rng.shuffle(rowNames);
+        notes = '\n'.join(random_text(rng, words, 1, 5) for j in range(rng.randint(0, 2)));
+        scheduleRows.append([rng.choice(days), eventType, random_time(rng), random_time(rng)] + rowNames + ['', notes]);
+    # days must appear in order; sort by position of the day, keeping the shuffled order within a day
+    scheduleRows[2:] = sorted(scheduleRows[2:], key=lambda row: days.index(row[0]));
+    write_csv(os.path.join(directory, gensched.inputFiles['schedule']), scheduleRows);
+
+
+#
+# comparison
+#
+
+def minimized_diff(expected, actual, maxLines = 20):
+    # reports only the first hunk where the outputs diverge, with a little context
+    diff = difflib.unified_diff(expected.splitlines(), actual.splitlines(), fromfile='expected', tofile='actual', n=2, lineterm='');
+
+    lines = [];
+    numHunks = 0;
+    for line in diff:
+        if line.startswith('@@'):
+            numHunks = numHunks + 1;
+            if numHunks > 1:
+                lines.append('(later differences omitted)');
+                break;
+        if len(lines) == maxLines:
+            lines.append('...');
+            break;
+        lines.append(line);
+
+    if lines == []:
+        # same lines, so the outputs differ only in line endings or a final newline
+        lines.append('outputs differ only in line endings or a final newline');
+
+    return '\n'.join(lines);
+
+
+def check_output(caseName, modeName, expected, actual, failures):
+    if actual is None or actual == expected:
+        return;
+
+    failures.append(caseName + ' [' + modeName + ']: ' + minimized_diff(expected, actual));
+
+
+def check_input_set(caseName, directory, modes, golden, failures):
+    expected = renderModes[referenceMode](directory);
+
+    if golden is not None:
+        check_output(caseName, 'golden', golden, expected, failures);
+
+    for modeName in modes:
+        if modeName != referenceMode:
+            check_output(caseName, modeName, expected, renderModes[modeName](directory), failures);
+
+
+def check_functions(rng, count, failures):
+    alphabet = list(string.printable) + accentedChars;
+    affiliations = list(affilclean.affiliation_changes.keys()) + list(affilclean.abbreviations.keys());
+
+    for i in range(count):
+        text = ''.join(rng.choice(alphabet) for j in range(rng.randint(0, 40)));
+        if gensched.html_accent_replacement(text) != reference_html_accent_replacement(text):
+            failures.append('html_accent_replacement(' + repr(text) + '): ' + repr(gensched.html_accent_replacement(text))
+                    + ' != ' + repr(reference_html_accent_replacement(text)));
+
+        affiliation = rng.choice(affiliations) if rng.random() < 0.5 else text;
+        if rng.random() < 0.3:
+            affiliation = '  ' + affiliation + ' ';
+        if affilclean.clean_affil(affiliation) != reference_clean_affil(affiliation):
+            failures.append('clean_affil(' + repr(affiliation) + '): ' + repr(affilclean.clean_affil(affiliation))
+                    + ' != ' + repr(reference_clean_affil(affiliation)));
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Checks that all render modes produce byte-identical output.');
+    parser.add_argument('-c', '--corpus', type=str, action='append', default=[], help='directory containing a real input set; may be repeated');
+    parser.add_argument('-g', '--golden', type=str, default=None, help='directory of golden outputs for the corpus');
+    parser.add_argument('-r', '--record', action='store_true', help='record golden outputs for the corpus instead of checking them');
+    parser.add_argument('-n', '--synthetic', type=int, default=200, help='number of random input sets to generate');
+    parser.add_argument('-f', '--functions', type=int, default=5000, help='number of random strings to check text cleanup functions with');
+    parser.add_argument('--seed', type=int, default=1, help='seed for the random inputs; failures are reproducible with the same seed');
+    parser.add_argument('-m', '--modes', type=str, default='direct,stdout,hotcrp,pool', help='render modes to compare against the reference (' + ', '.join(renderModes) + ')');
+    options = parser.parse_args();
+
+    modes = [mode for mode in options.modes.split(',') if mode != ""];
+    for mode in modes:
+        if mode not in renderModes:
+            parser.error("unknown render mode '" + mode + "'");
+
+    gensched.load_templates(templateFilename);
+
+    failures = [];
+
+    if options.record:
+        if options.golden is None:
+            parser.error("--record needs --golden");
+        os.makedirs(options.golden, exist_ok=True);
+        for directory in options.corpus:
+            goldenFile = os.path.join(options.golden, os.path.basename(os.path.abspath(directory)) + '.html');
+            with open(goldenFile, mode = "w", encoding="utf8", newline='') as outputFile:
+                outputFile.write(renderModes[referenceMode](directory));
+            print("STAT: recorded " + goldenFile, file=sys.stderr);
+        sys.exit(0);
+
+    for directory in options.corpus:
+        golden = None;
+        if options.golden is not None:
+            goldenFile = os.path.join(options.golden, os.path.basename(os.path.abspath(directory)) + '.html');
+            with open(goldenFile, mode = "r", encoding="utf8", newline='') as inputFile:
+                golden = inputFile.read();
+        check_input_set(directory, directory, modes, golden, failures);
+
+    rng = random.Random(options.seed);
+    for case in range(options.synthetic):
+        with tempfile.TemporaryDirectory() as directory:
+            generate_inputs(directory, rng);
+            # exercise the optional markup as well
+            gensched.printLocations = rng.random() < 0.5;
+            gensched.printJSInline = rng.random() < 0.5;
+            # small chunks, so that HotCRP elements are split across chunk boundaries
+            gensched.hotcrpChunkSize = rng.randint(1, 256);
+            check_input_set('synthetic #' + str(case) + ' (seed ' + str(options.seed) + ')', directory, modes, None, failures);
+
+    check_functions(rng, options.functions, failures);
+
+    for failure in failures:
+        print('FAIL: ' + failure);
+
+    print("STAT: " + str(len(options.corpus)) + " corpus and " + str(options.synthetic) + " synthetic input sets, "
+            + str(options.functions) + " function inputs; " + str(len(failures)) + " failures", file=sys.stderr);
+
+    sys.exit(1 if failures else 0);
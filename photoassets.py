@@ -0,0 +1,171 @@
+# PHOTOASSETS.PY
+#
+# optional stage that turns local keynote speaker photos into resized
+#   JPEG and WebP variants for responsive <img srcset="..."> markup
+#
+# requires Pillow (pip install Pillow); variants are cached on disk by a
+#   hash of the source photo and the settings, so unchanged photos are
+#   never processed again
+
+import os
+import sys
+import json
+import hashlib
+import concurrent.futures
+from collections import OrderedDict
+
+from confconfig import *
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None;
+
+photoFormats = OrderedDict([
+        ('webp', ('WEBP', 'image/webp')),
+        ('jpg', ('JPEG', 'image/jpeg'))
+        ]);
+
+# bump whenever resize_photo changes how the variants look, so cached ones are regenerated
+variantVersion = 2;
+
+
+def is_local_photo(photo):
+    return photo != "" and "://" not in photo and not photo.startswith("//") and not photo.startswith("data:");
+
+
+def photo_digest(sourceFile):
+    global photoWidths;
+    global photoQuality;
+    global variantVersion;
+
+    # settings are part of the hash, so changing them regenerates the variants
+    digest = hashlib.sha256();
+    with open(sourceFile, mode = "rb") as photoFile:
+        for chunk in iter(lambda: photoFile.read(1 << 20), b''):
+            digest.update(chunk);
+    digest.update(json.dumps([photoWidths, photoQuality, variantVersion]).encode('utf8'));
+
+    return digest.hexdigest()[:16];
+
+
+def variant_filename(digest, width, extension):
+    return digest + '-' + str(width) + '.' + extension;
+
+
+def load_cached_widths(outputDirectory, digest):
+    manifestFile = os.path.join(outputDirectory, digest + '.json');
+    if not os.path.exists(manifestFile):
+        return None;
+
+    # a truncated or hand-edited manifest is treated as a cache miss
+    try:
+        with open(manifestFile, mode = "r", encoding="utf8") as manifest:
+            widths = json.load(manifest);
+    except ValueError:
+        return None;
+    if not isinstance(widths, list) or widths == [] or not all(isinstance(width, int) for width in widths):
+        return None;
+
+    for width in widths:
+        for extension in photoFormats:
+            if not os.path.exists(os.path.join(outputDirectory, variant_filename(digest, width, extension))):
+                return None;
+
+    return widths;
+
+
+def resize_photo(sourceFile, digest, outputDirectory, widths, quality):
+    # runs in a worker process; returns the widths that were written
+    with Image.open(sourceFile) as photo:
+        photo.load();
+        # phone photos are often stored sideways with an EXIF Orientation tag;
+        #   apply it, since the tag is not written to the variants
+        photo = ImageOps.exif_transpose(photo);
+        if photo.mode not in ('RGB', 'RGBA'):
+            photo = photo.convert('RGBA' if 'transparency' in photo.info else 'RGB');
+
+        # never upscale; a photo narrower than every width is kept at its own size
+        targetWidths = sorted(set(min(width, photo.width) for width in widths));
+
+        for width in targetWidths:
+            height = max(1, round(photo.height * width / photo.width));
+            resized = photo if width == photo.width else photo.resize((width, height), Image.LANCZOS);
+            resized.save(os.path.join(outputDirectory, variant_filename(digest, width, 'webp')), 'WEBP', quality=quality);
+            resized.convert('RGB').save(os.path.join(outputDirectory, variant_filename(digest, width, 'jpg')), 'JPEG',
+                    quality=quality, optimize=True, progressive=True);
+
+    # the manifest is written last, so an interrupted run is not mistaken for a cached one
+    with open(os.path.join(outputDirectory, digest + '.json'), mode = "w", encoding="utf8") as manifest:
+        json.dump(targetWidths, manifest);
+
+    return targetWidths;
+
+
+def photo_variants(digest, widths):
+    global photoURLPath;
+
+    variants = OrderedDict();
+    for extension, (imageFormat, mimeType) in photoFormats.items():
+        variants[mimeType] = ', '.join(photoURLPath + variant_filename(digest, width, extension) + ' ' + str(width) + 'w' for width in widths);
+
+    # the fallback src is the largest JPEG
+    variants['src'] = photoURLPath + variant_filename(digest, widths[-1], 'jpg');
+
+    return variants;
+
+
+def process_keynote_photos(keynoteDetails, baseDirectory, outputDirectory):
+    global photoWidths;
+    global photoQuality;
+
+    # returns keynote -> variants (see photo_variants) for every keynote with a local photo
+    photos = OrderedDict();
+    for keynoteID, details in keynoteDetails.items():
+        if is_local_photo(details['Photo URL']):
+            sourceFile = os.path.join(baseDirectory, details['Photo URL']);
+            if not os.path.exists(sourceFile):
+                print("  **ERROR**: Photo '" + details['Photo URL'] + "' for " + keynoteID + " not found; using it as a URL", file=sys.stderr);
+                continue;
+            photos[keynoteID] = sourceFile;
+
+    if len(photos) == 0:
+        return {};
+
+    if Image is None:
+        print("  **ERROR**: Pillow is not installed (pip install Pillow); keynote photos are used as-is", file=sys.stderr);
+        return {};
+
+    if len(photoWidths) == 0:
+        print("  **ERROR**: photoWidths in confconfig.py is empty; keynote photos are used as-is", file=sys.stderr);
+        return {};
+
+    os.makedirs(outputDirectory, exist_ok=True);
+
+    digests = OrderedDict((keynoteID, photo_digest(sourceFile)) for keynoteID, sourceFile in photos.items());
+    widthsByDigest = {};
+    pending = OrderedDict();
+    for keynoteID, digest in digests.items():
+        if digest in widthsByDigest or digest in pending:
+            continue;
+        cachedWidths = load_cached_widths(outputDirectory, digest);
+        if cachedWidths is not None:
+            widthsByDigest[digest] = cachedWidths;
+        else:
+            pending[digest] = photos[keynoteID];
+
+    # decoding and resizing is CPU-bound, so photos are processed in separate processes
+    if len(pending) > 0:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as pool:
+            jobs = OrderedDict((digest, pool.submit(resize_photo, sourceFile, digest, outputDirectory, photoWidths, photoQuality))
+                    for digest, sourceFile in pending.items());
+            for digest, job in jobs.items():
+                try:
+                    widthsByDigest[digest] = job.result();
+                except Exception as error:
+                    print("  **ERROR**: Cannot process photo '" + pending[digest] + "': " + str(error), file=sys.stderr);
+
+    print("STAT: " + str(len(pending)) + " of " + str(len(set(digests.values()))) + " keynote photos processed in " + outputDirectory, file=sys.stderr);
+
+    return OrderedDict((keynoteID, photo_variants(digest, widthsByDigest[digest]))
+            for keynoteID, digest in digests.items() if digest in widthsByDigest);
@@ -0,0 +1,243 @@
+# PROGDIFF.PY
+#
+# script to list what changed between two versions of a conference program
+#   (events, sessions, keynotes, and papers), for notifying speakers
+#
+# each version is either a directory of input files, as read by gensched.py,
+#   or a program state saved with gensched.py --save-state
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from collections import OrderedDict
+
+from textbackends import html_to_text
+
+stateFormat = 1;
+
+entityOrder = ['event', 'keynote', 'session', 'paper'];
+
+
+def entity_hash(fields):
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode('utf8')).hexdigest();
+
+
+def add_entity(entities, key, entityType, label, fields):
+    if key in entities:
+        print("  **ERROR**: " + label + " appears more than once in the program; only the first is compared", file=sys.stderr);
+        return;
+
+    entities[key] = OrderedDict([
+            ('type', entityType),
+            ('label', label),
+            ('fields', fields),
+            ('hash', entity_hash(fields))
+            ]);
+
+
+def program_entities(program):
+    # imported here, since gensched.py imports this module
+    import gensched
+
+    # flattens the program (see build_program() in gensched.py) into entities keyed
+    #   by what they are rather than by where they are, so moves show up as changes
+    entities = OrderedDict();
+    occurrences = {};
+
+    dayDates = OrderedDict(program['workshops']['dates']);
+    dayEvents = [program['workshops']['events']];
+    for day in program['days']:
+        dayDates[day['day']] = day['date'];
+        dayEvents.append(day['events']);
+
+    for events in dayEvents:
+        for event in events:
+            when = OrderedDict([
+                    ('day', event['day']),
+                    ('date', dayDates.get(event['day'], "")),
+                    ('start', event['start']),
+                    ('end', event['end'])
+                    ]);
+
+            for session in event['sessions']:
+                paperKeys = [];
+                for paper in session['papers']:
+                    paperKey = 'paper:' + (paper['id'] if paper['id'] is not None else paper['title']);
+                    paperKeys.append(paperKey);
+                    fields = OrderedDict(when);
+                    fields.update([
+                            ('session', session['id']),
+                            ('location', session['location']),
+                            ('title', paper['title']),
+                            ('authors', paper['authors']),
+                            ('links', paper['links'])
+                            ]);
+                    add_entity(entities, paperKey, 'paper', "Paper '" + paper['title'] + "'", fields);
+
+                fields = OrderedDict(when);
+                fields.update([
+                        ('location', session['location']),
+                        ('title', session['title']),
+                        ('chair', session['chair']),
+                        ('affiliation', session['affiliation']),
+                        ('lightningTalks', session['lightningTalks']),
+                        ('notes', event['notes']),
+                        ('papers', paperKeys)
+                        ]);
+                add_entity(entities, 'session:' + session['id'], 'session', 'Session ' + session['id'], fields);
+
+            for item in event['items']:
+                keynote = item['keynote'];
+                fields = OrderedDict(when);
+                fields.update([
+                        ('location', item['location']),
+                        ('notes', event['notes'])
+                        ]);
+
+                if keynote is not None:
+                    for field in ['title', 'speaker', 'affiliation', 'photo', 'abstract', 'bio', 'links']:
+                        fields[field] = keynote[field];
+                    add_entity(entities, 'keynote:' + keynote['id'], 'keynote', keynote['id'], fields);
+                else:
+                    name = html_to_text(item['name']);
+                    occurrence = gensched.event_occurrence(occurrences, event['day'], name);
+                    fields['type'] = event['type'];
+                    label = event['day'] + ' ' + name;
+                    if occurrence > 1:
+                        label += ' (#' + str(occurrence) + ')';
+                    add_entity(entities, 'event:' + event['day'] + ':' + name + ':' + str(occurrence), 'event', label, fields);
+
+    return entities;
+
+
+def save_program_state(program, filename):
+    with open(filename, mode = "w", encoding="utf8") as stateFile:
+        json.dump(OrderedDict([
+                ('format', stateFormat),
+                ('entities', program_entities(program))
+                ]), stateFile, ensure_ascii=False);
+
+
+def load_program_state(filename):
+    with open(filename, mode = "r", encoding="utf8") as stateFile:
+        state = json.load(stateFile, object_pairs_hook=OrderedDict);
+
+    if state.get('format') != stateFormat:
+        raise ValueError(filename + " is not a program state saved by this version of gensched.py");
+
+    return state['entities'];
+
+
+def read_program_entities(directory):
+    # imported here; see program_entities
+    import gensched
+
+    gensched.clear_inputs();
+    gensched.read_all_inputs(gensched.input_options(directory));
+
+    return program_entities(gensched.build_program());
+
+
+def load_entities(path):
+    if os.path.isdir(path):
+        return read_program_entities(path);
+    return load_program_state(path);
+
+
+def diff_entities(oldEntities, newEntities):
+    changelog = OrderedDict([
+            ('added', []),
+            ('removed', []),
+            ('changed', [])
+            ]);
+
+    for key, new in newEntities.items():
+        old = oldEntities.get(key);
+        if old is None:
+            changelog['added'].append(OrderedDict([('key', key), ('type', new['type']), ('label', new['label']), ('fields', new['fields'])]));
+            continue;
+
+        # entities whose content hashes match are unchanged; skip without comparing fields
+        if old['hash'] == new['hash']:
+            continue;
+
+        changes = OrderedDict();
+        for field in new['fields']:
+            oldValue = old['fields'].get(field);
+            if oldValue != new['fields'][field]:
+                changes[field] = OrderedDict([('old', oldValue), ('new', new['fields'][field])]);
+        for field in old['fields']:
+            if field not in new['fields']:
+                changes[field] = OrderedDict([('old', old['fields'][field]), ('new', None)]);
+        changelog['changed'].append(OrderedDict([('key', key), ('type', new['type']), ('label', new['label']), ('changes', changes)]));
+
+    for key, old in oldEntities.items():
+        if key not in newEntities:
+            changelog['removed'].append(OrderedDict([('key', key), ('type', old['type']), ('label', old['label']), ('fields', old['fields'])]));
+
+    for entries in changelog.values():
+        entries.sort(key=lambda entry: entityOrder.index(entry['type']));
+
+    return changelog;
+
+
+def format_value(value):
+    if value is None or value == "":
+        return '(none)';
+    if isinstance(value, str):
+        return "'" + value + "'";
+    return json.dumps(value, ensure_ascii=False);
+
+
+def format_changelog(changelog):
+    lines = [];
+
+    for entry in changelog['added']:
+        fields = entry['fields'];
+        lines.append('+ ' + entry['label'] + ': ' + fields['day'] + ' ' + fields['start'] + ' - ' + fields['end']
+                + (', Session ' + fields['session'] if 'session' in fields else ''));
+    for entry in changelog['removed']:
+        lines.append('- ' + entry['label']);
+    for entry in changelog['changed']:
+        lines.append('~ ' + entry['label']);
+        for field, change in entry['changes'].items():
+            lines.append('    ' + field + ': ' + format_value(change['old']) + ' -> ' + format_value(change['new']));
+
+    if lines == []:
+        lines.append('No changes.');
+
+    return '\n'.join(lines) + '\n';
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Lists the changes between two versions of the program.');
+    parser.add_argument('old', type=str, help='directory of input files, or a state saved with gensched.py --save-state');
+    parser.add_argument('new', type=str, help='directory of input files, or a state saved with gensched.py --save-state');
+    parser.add_argument('-j', '--json', type=str, default=None, help='file to write the changelog into as JSON');
+    options = parser.parse_args();
+
+    import gensched
+
+    try:
+        oldEntities = load_entities(options.old);
+        newEntities = load_entities(options.new);
+    except gensched.InputError as error:
+        print("**ERROR**: " + str(error), file=sys.stderr);
+        sys.exit(1);
+
+    startTime = time.perf_counter();
+    changelog = diff_entities(oldEntities, newEntities);
+    elapsed = time.perf_counter() - startTime;
+
+    print(format_changelog(changelog), end='');
+
+    if options.json is not None:
+        with open(options.json, mode = "w", encoding="utf8") as jsonFile:
+            json.dump(changelog, jsonFile, ensure_ascii=False, indent=2);
+
+    print("STAT: " + str(len(newEntities)) + " entities compared in " + "{:.1f}".format(elapsed * 1000) + " ms; "
+            + str(len(changelog['added'])) + " added, " + str(len(changelog['removed'])) + " removed, "
+            + str(len(changelog['changed'])) + " changed", file=sys.stderr);
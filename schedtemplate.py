@@ -0,0 +1,124 @@
+# SCHEDTEMPLATE.PY
+#
+# loads the markup templates used by gensched.py and compiles
+#   each block into a format string, cached per indent level
+#
+# template files contain blocks of the form
+#   @@ block-name
+#   <markup with {{field}} placeholders>
+#   @@ end
+# lines outside of a block are ignored and can be used for comments;
+# a line holding only {{> field}} inserts the field verbatim, without
+#   indent or newline, for nesting blocks that were already rendered
+
+import re
+
+fieldPattern = re.compile(r'\{\{\s*(\w+)\s*\}\}');
+rawLinePattern = re.compile(r'^\s*\{\{>\s*(\w+)\s*\}\}$');
+
+templateBlocks = {};
+compiledBlocks = {};
+indentStrings = {};
+
+
+def get_indent(indent):
+    pre = indentStrings.get(indent);
+    if pre is None:
+        pre = " " * indent;
+        indentStrings[indent] = pre;
+
+    return pre;
+
+
+def load_templates(filename):
+    global templateBlocks;
+    global compiledBlocks;
+
+    templateBlocks = {};
+    compiledBlocks = {};
+
+    with open(filename, mode = "r", encoding="utf8") as templateFile:
+        currentBlock = None;
+        lineNumber = 0;
+
+        for line in templateFile:
+            lineNumber = lineNumber + 1;
+            line = line.rstrip('\n');
+
+            if line.startswith("@@ "):
+                name = line[3:].strip();
+                if currentBlock is None:
+                    if name == "end":
+                        raise ValueError(filename + ":" + str(lineNumber) + ": '@@ end' outside of a block");
+                    if name in templateBlocks:
+                        raise ValueError(filename + ":" + str(lineNumber) + ": duplicate block '" + name + "'");
+                    currentBlock = name;
+                    templateBlocks[currentBlock] = [];
+                elif name == "end":
+                    currentBlock = None;
+                else:
+                    raise ValueError(filename + ":" + str(lineNumber) + ": block '" + currentBlock + "' is missing '@@ end'");
+            elif currentBlock is not None:
+                templateBlocks[currentBlock].append(line);
+
+        if currentBlock is not None:
+            raise ValueError(filename + ": block '" + currentBlock + "' is missing '@@ end'");
+
+
+def convert_line(line):
+    # escape literal braces, then turn {{field}} into {field}
+    converted = "";
+    position = 0;
+    for match in fieldPattern.finditer(line):
+        converted += line[position:match.start()].replace('{', '{{').replace('}', '}}');
+        converted += '{' + match.group(1) + '}';
+        position = match.end();
+    converted += line[position:].replace('{', '{{').replace('}', '}}');
+
+    return converted;
+
+
+def compile_block(blockName, indent):
+    if blockName not in templateBlocks:
+        raise KeyError("template block '" + blockName + "' not found");
+
+    pre = get_indent(indent);
+    compiled = "";
+
+    for line in templateBlocks[blockName]:
+        match = rawLinePattern.match(line);
+        if match:
+            compiled += '{' + match.group(1) + '}';
+        else:
+            compiled += pre + convert_line(line) + '\n';
+
+    return compiled;
+
+
+def compile_inline(blockName):
+    if blockName not in templateBlocks:
+        raise KeyError("template block '" + blockName + "' not found");
+
+    return '\n'.join(convert_line(line) for line in templateBlocks[blockName]);
+
+
+def render(blockName, indent, **fields):
+    key = (blockName, indent);
+    compiled = compiledBlocks.get(key);
+    if compiled is None:
+        compiled = compile_block(blockName, indent);
+        compiledBlocks[key] = compiled;
+
+    return compiled.format_map(fields);
+
+
+def render_inline(blockName, **fields):
+    # renders a block without indentation or a trailing newline,
+    #   for markup that is embedded within another line
+    key = (blockName, None);
+    compiled = compiledBlocks.get(key);
+    if compiled is None:
+        compiled = compile_inline(blockName);
+        compiledBlocks[key] = compiled;
+
+    return compiled.format_map(fields);
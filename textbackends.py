@@ -0,0 +1,290 @@
+# TEXTBACKENDS.PY
+#
+# Markdown and LaTeX renderers for the program structure built by
+#   build_program() in gensched.py
+
+import re
+import html
+
+from confconfig import *
+
+
+def html_to_text(text):
+    # event names and notes in the schedule may contain HTML markup and entities
+    return html.unescape(re.sub(r'<[^>]*>', '', text));
+
+
+def format_time_range(event, zone):
+    return event['start'] + ' – ' + event['end'] + ' ' + zone;
+
+
+def format_location(location, floor):
+    if location == "" or location == "other":
+        return "";
+    if floor is not None and floor != "":
+        return location + ' (' + floor + ')';
+    return location;
+
+
+#
+# Markdown
+#
+
+def markdown_escape(text):
+    return re.sub(r'([\\`*_\[\]<>#|])', r'\\\1', text);
+
+
+def markdown_links(links):
+    return ' · '.join('[' + markdown_escape(label) + '](' + url + ')' for label, url in links.items() if url != "");
+
+
+def markdown_location(item):
+    global printLocations;
+
+    location = format_location(item['location'], item['floor']);
+    if not printLocations or location == "":
+        return [];
+
+    return ['*Location: ' + markdown_escape(location) + '*', ''];
+
+
+def markdown_notes(notes):
+    if notes == "":
+        return [];
+
+    return ['- ' + markdown_escape(html_to_text(note)) for note in notes.split('\n')] + [''];
+
+
+def markdown_session(session):
+    heading = 'Session ' + session['id'];
+    if session['title'] != "":
+        heading += ': ' + session['title'];
+    lines = ['#### ' + markdown_escape(heading), ''];
+    lines += markdown_location(session);
+
+    if session['chair'] != "":
+        chair = 'Session Chair: ' + markdown_escape(session['chair']);
+        if session['affiliation'] != "":
+            chair += ' (' + markdown_escape(session['affiliation']) + ')';
+        lines += [chair, ''];
+
+    if session['lightningTalks'] != "":
+        lines += [markdown_links({'Session Lightning Talks': session['lightningTalks']}), ''];
+
+    for paper in session['papers']:
+        entry = ['- **' + markdown_escape(paper['title']) + '**'];
+        if paper['authors'] is not None:
+            entry.append('  ' + markdown_escape(paper['authors']));
+        links = markdown_links(paper['links']);
+        if links != "":
+            entry.append('  ' + links);
+        # two trailing spaces force a line break within the list item
+        lines.append('  \n'.join(entry));
+    lines.append('');
+
+    return lines;
+
+
+def markdown_event(event, showDay, zone):
+    lines = [];
+    when = format_time_range(event, zone);
+    if showDay:
+        when = event['day'] + ', ' + when;
+
+    if len(event['sessions']) > 0:
+        lines += ['### ' + markdown_escape(when), ''];
+        lines += markdown_notes(event['notes']);
+        for session in event['sessions']:
+            lines += markdown_session(session);
+
+    for item in event['items']:
+        keynote = item['keynote'];
+        heading = when + ': ' + html_to_text(item['name']);
+        if keynote is not None and keynote['title'] != "":
+            heading += ': ' + keynote['title'];
+        lines += ['### ' + markdown_escape(heading), ''];
+        lines += markdown_location(item);
+        lines += markdown_notes(event['notes']);
+
+        if keynote is not None:
+            if keynote['speaker'] != "":
+                speaker = '**' + markdown_escape(keynote['speaker']) + '**';
+                if keynote['affiliation'] != "":
+                    speaker += ' (' + markdown_escape(keynote['affiliation']) + ')';
+                lines += [speaker, ''];
+            if keynote['abstract'] != "":
+                lines += ['**Abstract:** ' + markdown_escape(keynote['abstract']).replace('\n', '  \n'), ''];
+            if keynote['bio'] != "":
+                lines += ['**Bio:** ' + markdown_escape(keynote['bio']).replace('\n', '  \n'), ''];
+            links = markdown_links(keynote['links']);
+            if links != "":
+                lines += [links, ''];
+
+    return lines;
+
+
+def render_markdown(program):
+    zone = program['timeZone'];
+    workshops = program['workshops'];
+
+    dates = ' / '.join(day + ', ' + date for day, date in workshops['dates'].items());
+    lines = ['## ' + markdown_escape(dates + ': Workshops & Tutorials'), ''];
+    for event in workshops['events']:
+        lines += markdown_event(event, True, zone);
+
+    for day in program['days']:
+        lines += ['## ' + markdown_escape('Day ' + str(day['number']) + ': ' + day['day'] + ', ' + day['date']), ''];
+        for event in day['events']:
+            lines += markdown_event(event, False, zone);
+
+    return '\n'.join(lines).rstrip('\n') + '\n';
+
+
+#
+# LaTeX
+#
+
+latexSpecialChars = {
+        '\\': r'\textbackslash{}',
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+        '~': r'\textasciitilde{}',
+        '^': r'\textasciicircum{}',
+        '–': '--',
+        '—': '---'
+        };
+
+latexSpecialPattern = re.compile('|'.join(re.escape(char) for char in latexSpecialChars));
+
+
+def latex_escape(text):
+    return latexSpecialPattern.sub(lambda match: latexSpecialChars[match.group(0)], text);
+
+
+def latex_paragraphs(text):
+    return '\n\n'.join(latex_escape(paragraph) for paragraph in text.split('\n'));
+
+
+def latex_url(url):
+    return url.replace('\\', '/').replace('#', '\\#').replace('%', '\\%');
+
+
+def latex_links(links):
+    return ' $\\cdot$ '.join('\\href{' + latex_url(url) + '}{' + latex_escape(label) + '}' for label, url in links.items() if url != "");
+
+
+def latex_location(item):
+    global printLocations;
+
+    location = format_location(item['location'], item['floor']);
+    if not printLocations or location == "":
+        return [];
+
+    return ['\\textit{Location: ' + latex_escape(location) + '}', ''];
+
+
+def latex_notes(notes):
+    if notes == "":
+        return [];
+
+    return ['\\begin{itemize}'] + ['  \\item ' + latex_escape(html_to_text(note)) for note in notes.split('\n')] + ['\\end{itemize}', ''];
+
+
+def latex_session(session):
+    heading = 'Session ' + session['id'];
+    if session['title'] != "":
+        heading += ': ' + session['title'];
+    lines = ['\\subsubsection*{' + latex_escape(heading) + '}', ''];
+    lines += latex_location(session);
+
+    if session['chair'] != "":
+        chair = 'Session Chair: ' + latex_escape(session['chair']);
+        if session['affiliation'] != "":
+            chair += ' (' + latex_escape(session['affiliation']) + ')';
+        lines += [chair, ''];
+
+    if len(session['papers']) > 0:
+        lines.append('\\begin{itemize}');
+        for paper in session['papers']:
+            lines.append('  \\item \\textbf{' + latex_escape(paper['title']) + '}');
+            if paper['authors'] is not None:
+                lines.append('    \\\\ ' + latex_escape(paper['authors']));
+            links = latex_links(paper['links']);
+            if links != "":
+                lines.append('    \\\\ ' + links);
+        lines += ['\\end{itemize}', ''];
+
+    return lines;
+
+
+def latex_event(event, showDay, zone):
+    lines = [];
+    when = format_time_range(event, zone);
+    if showDay:
+        when = event['day'] + ', ' + when;
+
+    if len(event['sessions']) > 0:
+        lines += ['\\subsection*{' + latex_escape(when) + '}', ''];
+        lines += latex_notes(event['notes']);
+        for session in event['sessions']:
+            lines += latex_session(session);
+
+    for item in event['items']:
+        keynote = item['keynote'];
+        heading = when + ': ' + html_to_text(item['name']);
+        if keynote is not None and keynote['title'] != "":
+            heading += ': ' + keynote['title'];
+        lines += ['\\subsection*{' + latex_escape(heading) + '}', ''];
+        lines += latex_location(item);
+        lines += latex_notes(event['notes']);
+
+        if keynote is not None:
+            if keynote['speaker'] != "":
+                speaker = '\\textbf{' + latex_escape(keynote['speaker']) + '}';
+                if keynote['affiliation'] != "":
+                    speaker += ' (' + latex_escape(keynote['affiliation']) + ')';
+                lines += [speaker, ''];
+            if keynote['abstract'] != "":
+                lines += ['\\paragraph{Abstract}', latex_paragraphs(keynote['abstract']), ''];
+            if keynote['bio'] != "":
+                lines += ['\\paragraph{Bio}', latex_paragraphs(keynote['bio']), ''];
+            links = latex_links(keynote['links']);
+            if links != "":
+                lines += [links, ''];
+
+    return lines;
+
+
+def render_latex(program):
+    zone = program['timeZone'];
+    workshops = program['workshops'];
+
+    lines = [
+            '\\documentclass[11pt]{article}',
+            '\\usepackage[utf8]{inputenc}',
+            '\\usepackage[T1]{fontenc}',
+            '\\usepackage[margin=0.75in]{geometry}',
+            '\\usepackage{hyperref}',
+            '',
+            '\\begin{document}',
+            ''
+            ];
+
+    dates = ' / '.join(day + ', ' + date for day, date in workshops['dates'].items());
+    lines += ['\\section*{' + latex_escape(dates + ': Workshops & Tutorials') + '}', ''];
+    for event in workshops['events']:
+        lines += latex_event(event, True, zone);
+
+    for day in program['days']:
+        lines += ['\\newpage', '\\section*{' + latex_escape('Day ' + str(day['number']) + ': ' + day['day'] + ', ' + day['date']) + '}', ''];
+        for event in day['events']:
+            lines += latex_event(event, False, zone);
+
+    lines.append('\\end{document}');
+
+    return '\n'.join(lines) + '\n';